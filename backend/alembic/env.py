@@ -0,0 +1,61 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.database import Base, IS_SQLITE, engine
+from app.db import init_db  # noqa: F401  imports every model onto Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the lesson search index, which the ORM does not map, to its migration"""
+    if type_ == "table" and name.startswith("lessons_fts"):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name == "ix_lessons_search_vector":
+        return False
+    return True
+
+def run_migrations_offline() -> None:
+    """Emit SQL for the configured DATABASE_URL without connecting"""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=IS_SQLITE,
+        include_object=include_object,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    # init_db passes in its own connection; the alembic CLI uses the app engine
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+    with engine.connect() as connection:
+        _run(connection)
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite cannot ALTER most constraints; batch mode rebuilds the table
+        render_as_batch=IS_SQLITE,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
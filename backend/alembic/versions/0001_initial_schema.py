@@ -0,0 +1,151 @@
+"""Initial schema
+
+Tables as originally created by ``Base.metadata.create_all``. Databases
+created that way are stamped at this revision by ``init_db``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_superuser', sa.Boolean(), nullable=True),
+        sa.Column('avatar_url', sa.String(), nullable=True),
+        sa.Column('voice_id', sa.String(), nullable=True),
+        sa.Column('voice_name', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    op.create_table(
+        'topics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_topics_id', 'topics', ['id'], unique=False)
+
+    op.create_table(
+        'assets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('original_filename', sa.String(), nullable=False),
+        sa.Column('file_path', sa.String(), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('mime_type', sa.String(), nullable=False),
+        sa.Column('asset_type', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_assets_id', 'assets', ['id'], unique=False)
+
+    op.create_table(
+        'learning_paths',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('duration_weeks', sa.Integer(), nullable=True),
+        sa.Column('topic_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['topic_id'], ['topics.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_learning_paths_id', 'learning_paths', ['id'], unique=False)
+
+    op.create_table(
+        'lessons',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('script', sa.Text(), nullable=True),
+        sa.Column('week_number', sa.Integer(), nullable=False),
+        sa.Column('day_number', sa.Integer(), nullable=False),
+        sa.Column('learning_path_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['learning_path_id'], ['learning_paths.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_lessons_id', 'lessons', ['id'], unique=False)
+
+    op.create_table(
+        'videos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('video_url', sa.String(), nullable=False),
+        sa.Column('audio_url', sa.String(), nullable=True),
+        sa.Column('transcript', sa.Text(), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('lesson_id', sa.Integer(), nullable=False),
+        sa.Column('voice_id', sa.String(), nullable=True),
+        sa.Column('avatar_url', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_videos_id', 'videos', ['id'], unique=False)
+
+    op.create_table(
+        'progress',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('lesson_id', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('completion_percentage', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_progress_id', 'progress', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_progress_id', table_name='progress')
+    op.drop_table('progress')
+    op.drop_index('ix_videos_id', table_name='videos')
+    op.drop_table('videos')
+    op.drop_index('ix_lessons_id', table_name='lessons')
+    op.drop_table('lessons')
+    op.drop_index('ix_learning_paths_id', table_name='learning_paths')
+    op.drop_table('learning_paths')
+    op.drop_index('ix_assets_id', table_name='assets')
+    op.drop_table('assets')
+    op.drop_index('ix_topics_id', table_name='topics')
+    op.drop_table('topics')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
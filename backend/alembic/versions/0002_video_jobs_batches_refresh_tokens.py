@@ -0,0 +1,98 @@
+"""Video job queue, video batches and refresh tokens
+
+These tables were first added through ``create_all``, which never adds
+columns to existing tables, so objects that already exist are skipped and
+only what is missing (notably ``videos.batch_id``) is created.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:10:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if 'video_batches' not in tables:
+        op.create_table(
+            'video_batches',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('learning_path_id', sa.Integer(), nullable=True),
+            sa.Column('total_videos', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['learning_path_id'], ['learning_paths.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_video_batches_id', 'video_batches', ['id'], unique=False)
+
+    if 'batch_id' not in {column['name'] for column in inspector.get_columns('videos')}:
+        with op.batch_alter_table('videos') as batch_op:
+            batch_op.add_column(sa.Column('batch_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_videos_batch_id', 'video_batches', ['batch_id'], ['id'])
+
+    if 'video_jobs' not in tables:
+        op.create_table(
+            'video_jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('video_id', sa.Integer(), nullable=False),
+            sa.Column('stage', sa.String(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('lesson_text', sa.Text(), nullable=False),
+            sa.Column('voice_id', sa.String(), nullable=False),
+            sa.Column('avatar_path', sa.String(), nullable=False),
+            sa.Column('audio_path', sa.String(), nullable=False),
+            sa.Column('video_path', sa.String(), nullable=False),
+            sa.Column('worker_id', sa.String(), nullable=True),
+            sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('run_after', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['video_id'], ['videos.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_video_jobs_id', 'video_jobs', ['id'], unique=False)
+
+    if 'refresh_tokens' not in tables:
+        op.create_table(
+            'refresh_tokens',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('jti', sa.String(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_refresh_tokens_id', 'refresh_tokens', ['id'], unique=False)
+        op.create_index('ix_refresh_tokens_jti', 'refresh_tokens', ['jti'], unique=True)
+        op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_tokens_user_id', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_jti', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_id', table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
+    op.drop_index('ix_video_jobs_id', table_name='video_jobs')
+    op.drop_table('video_jobs')
+    with op.batch_alter_table('videos') as batch_op:
+        batch_op.drop_constraint('fk_videos_batch_id', type_='foreignkey')
+        batch_op.drop_column('batch_id')
+    op.drop_index('ix_video_batches_id', table_name='video_batches')
+    op.drop_table('video_batches')
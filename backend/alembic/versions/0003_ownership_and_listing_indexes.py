@@ -0,0 +1,55 @@
+"""Indexes for ownership joins and listing queries
+
+Every endpoint filters or joins on these foreign keys. Lessons are listed
+by learning path in week/day order, so that index is composite; progress
+gets one row per user and lesson.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:20:00
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_topics_user_id', 'topics', ['user_id'], unique=False)
+    op.create_index('ix_learning_paths_topic_id', 'learning_paths', ['topic_id'], unique=False)
+    op.create_index(
+        'ix_lessons_learning_path_schedule', 'lessons',
+        ['learning_path_id', 'week_number', 'day_number'], unique=False
+    )
+    op.create_index('ix_videos_lesson_id', 'videos', ['lesson_id'], unique=False)
+    op.create_index('ix_videos_batch_id', 'videos', ['batch_id'], unique=False)
+    op.create_index('ix_assets_user_id', 'assets', ['user_id'], unique=False)
+    op.create_index('ix_video_batches_user_id', 'video_batches', ['user_id'], unique=False)
+    op.create_index('ix_video_jobs_video_id', 'video_jobs', ['video_id'], unique=False)
+    op.create_index('ix_video_jobs_status_stage', 'video_jobs', ['status', 'stage'], unique=False)
+
+    # Keep the oldest row of any duplicates so the unique index can be built
+    op.execute(
+        "DELETE FROM progress WHERE id NOT IN "
+        "(SELECT MIN(id) FROM progress GROUP BY user_id, lesson_id)"
+    )
+    op.create_index('uq_progress_user_lesson', 'progress', ['user_id', 'lesson_id'], unique=True)
+    op.create_index('ix_progress_lesson_id', 'progress', ['lesson_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_progress_lesson_id', table_name='progress')
+    op.drop_index('uq_progress_user_lesson', table_name='progress')
+    op.drop_index('ix_video_jobs_status_stage', table_name='video_jobs')
+    op.drop_index('ix_video_jobs_video_id', table_name='video_jobs')
+    op.drop_index('ix_video_batches_user_id', table_name='video_batches')
+    op.drop_index('ix_assets_user_id', table_name='assets')
+    op.drop_index('ix_videos_batch_id', table_name='videos')
+    op.drop_index('ix_videos_lesson_id', table_name='videos')
+    op.drop_index('ix_lessons_learning_path_schedule', table_name='lessons')
+    op.drop_index('ix_learning_paths_topic_id', table_name='learning_paths')
+    op.drop_index('ix_topics_user_id', table_name='topics')
@@ -0,0 +1,49 @@
+"""Denormalized owner_id on learning paths, lessons and videos
+
+Backfilled from topics.user_id down the hierarchy. From here on the
+listeners in app.models.ownership keep it current.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+TABLES = ('learning_paths', 'lessons', 'videos')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('owner_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(f'fk_{table}_owner_id', 'users', ['owner_id'], ['id'])
+            batch_op.create_index(f'ix_{table}_owner_id', ['owner_id'], unique=False)
+
+    op.execute(
+        "UPDATE learning_paths SET owner_id = "
+        "(SELECT topics.user_id FROM topics WHERE topics.id = learning_paths.topic_id)"
+    )
+    op.execute(
+        "UPDATE lessons SET owner_id = "
+        "(SELECT learning_paths.owner_id FROM learning_paths WHERE learning_paths.id = lessons.learning_path_id)"
+    )
+    op.execute(
+        "UPDATE videos SET owner_id = "
+        "(SELECT lessons.owner_id FROM lessons WHERE lessons.id = videos.lesson_id)"
+    )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(f'ix_{table}_owner_id')
+            batch_op.drop_constraint(f'fk_{table}_owner_id', type_='foreignkey')
+            batch_op.drop_column('owner_id')
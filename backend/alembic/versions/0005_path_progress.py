@@ -0,0 +1,57 @@
+"""Per learning path completion summaries
+
+Filled here from existing lessons and progress; from here on
+app.services.path_progress keeps them current.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'path_progress',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('learning_path_id', sa.Integer(), nullable=False),
+        sa.Column('lessons_completed', sa.Integer(), nullable=False),
+        sa.Column('lessons_total', sa.Integer(), nullable=False),
+        sa.Column('avg_completion', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['learning_path_id'], ['learning_paths.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_path_progress_id'), 'path_progress', ['id'], unique=False)
+    op.create_index(op.f('ix_path_progress_learning_path_id'), 'path_progress', ['learning_path_id'], unique=False)
+    op.create_index('uq_path_progress_user_path', 'path_progress', ['user_id', 'learning_path_id'], unique=True)
+
+    op.execute(
+        "INSERT INTO path_progress (user_id, learning_path_id, lessons_total, lessons_completed, avg_completion) "
+        "SELECT learning_paths.owner_id, learning_paths.id, count(lessons.id), "
+        "coalesce(sum(CASE WHEN progress.completed THEN 1 ELSE 0 END), 0), "
+        "coalesce(avg(coalesce(progress.completion_percentage, 0)), 0) "
+        "FROM learning_paths "
+        "LEFT OUTER JOIN lessons ON lessons.learning_path_id = learning_paths.id "
+        "LEFT OUTER JOIN progress ON progress.lesson_id = lessons.id "
+        "AND progress.user_id = learning_paths.owner_id "
+        "WHERE learning_paths.owner_id IS NOT NULL "
+        "GROUP BY learning_paths.id, learning_paths.owner_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_path_progress_user_path', table_name='path_progress')
+    op.drop_index(op.f('ix_path_progress_learning_path_id'), table_name='path_progress')
+    op.drop_index(op.f('ix_path_progress_id'), table_name='path_progress')
+    op.drop_table('path_progress')
@@ -0,0 +1,79 @@
+"""Full-text search index over lesson title, content and script
+
+SQLite gets an external-content FTS5 table kept in sync by triggers on
+lessons. It also indexes owner_id, so searches intersect with the owner's
+lessons inside FTS5 rather than ranking every user's matches first; PostgreSQL gets a generated, weighted tsvector column with a GIN
+index. Neither is mapped by the ORM, and env.py leaves them out of
+autogenerate.
+
+A later batch_alter_table on lessons rebuilds the table on SQLite, which
+drops its triggers; such a migration must recreate them.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 14:00:00
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+SQLITE_TRIGGERS = {
+    'lessons_fts_insert': (
+        "AFTER INSERT ON lessons BEGIN "
+        "INSERT INTO lessons_fts (rowid, title, content, script, owner_id) "
+        "VALUES (new.id, new.title, new.content, new.script, new.owner_id); "
+        "END"
+    ),
+    'lessons_fts_delete': (
+        "AFTER DELETE ON lessons BEGIN "
+        "INSERT INTO lessons_fts (lessons_fts, rowid, title, content, script, owner_id) "
+        "VALUES ('delete', old.id, old.title, old.content, old.script, old.owner_id); "
+        "END"
+    ),
+    'lessons_fts_update': (
+        "AFTER UPDATE OF title, content, script, owner_id ON lessons BEGIN "
+        "INSERT INTO lessons_fts (lessons_fts, rowid, title, content, script, owner_id) "
+        "VALUES ('delete', old.id, old.title, old.content, old.script, old.owner_id); "
+        "INSERT INTO lessons_fts (rowid, title, content, script, owner_id) "
+        "VALUES (new.id, new.title, new.content, new.script, new.owner_id); "
+        "END"
+    ),
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE lessons_fts USING fts5("
+            "title, content, script, owner_id, content='lessons', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER {name} {body}")
+        op.execute("INSERT INTO lessons_fts (lessons_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE lessons ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(script, '')), 'C')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX ix_lessons_search_vector ON lessons USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS lessons_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_lessons_search_vector")
+        op.execute("ALTER TABLE lessons DROP COLUMN IF EXISTS search_vector")
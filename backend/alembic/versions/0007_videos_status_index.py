@@ -0,0 +1,25 @@
+"""Index videos by status
+
+Orphan recovery looks for videos stuck in processing on every sweep,
+which otherwise reads the whole videos table.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 16:00:00
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_videos_status', 'videos', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_status', table_name='videos')
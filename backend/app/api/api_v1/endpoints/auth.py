@@ -1,28 +1,55 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import (
+    create_access_token, create_refresh_token, decode_refresh_token,
+    verify_password_async, get_password_hash_async
+)
 from app.db.database import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserLogin, Token, User as UserSchema
+from app.models.refresh_token import RefreshToken
+from app.schemas.user import UserCreate, UserLogin, Token, RefreshTokenRequest, User as UserSchema
 
 router = APIRouter()
 
+async def issue_tokens(db: AsyncSession, user: User) -> dict:
+    """Access token plus a refresh token recorded for later revocation"""
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.email}, expires_delta=access_token_expires
+    )
+    refresh_token, jti, expires_at = create_refresh_token(user.email)
+    db.add(RefreshToken(jti=jti, user_id=user.id, expires_at=expires_at))
+    await db.commit()
+    
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+def invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 @router.post("/register", response_model=UserSchema)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    # Don't hold a pooled connection while waiting on bcrypt
+    await db.close()
+    
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -30,45 +57,99 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         is_active=user_data.is_active
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.hashed_password):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(User).where(User.email == user_data.email))
+    # Don't hold a pooled connection while waiting on bcrypt
+    await db.close()
+    if not user or not await verify_password_async(user_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+    return await issue_tokens(db, user)
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    # Don't hold a pooled connection while waiting on bcrypt
+    await db.close()
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    return await issue_tokens(db, user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """Exchange a refresh token for new tokens without checking the password.
+
+    Refresh tokens are single use: each call revokes the presented token and
+    issues a new one. Presenting an already rotated token revokes every
+    outstanding token of that user, since it has probably been stolen.
+    Logging out deletes the token instead, so replaying it afterwards is
+    only an unknown token.
+    """
+    payload = decode_refresh_token(request.refresh_token)
+    if payload is None:
+        raise invalid_refresh_token()
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    stored = await db.scalar(select(RefreshToken).where(RefreshToken.jti == payload["jti"]))
+    if not stored:
+        raise invalid_refresh_token()
+    
+    now = datetime.utcnow()
+    if stored.revoked_at is not None:
+        await db.execute(update(RefreshToken).where(
+            RefreshToken.user_id == stored.user_id,
+            RefreshToken.revoked_at.is_(None)
+        ).values(revoked_at=now))
+        await db.commit()
+        raise invalid_refresh_token()
+    
+    user = await db.get(User, stored.user_id)
+    if not user or not user.is_active or user.email != payload["sub"]:
+        raise invalid_refresh_token()
+    
+    # Conditional update so two concurrent refreshes cannot both rotate
+    rotated = await db.execute(update(RefreshToken).where(
+        RefreshToken.id == stored.id,
+        RefreshToken.revoked_at.is_(None)
+    ).values(revoked_at=now))
+    if not rotated.rowcount:
+        await db.rollback()
+        raise invalid_refresh_token()
+    
+    return await issue_tokens(db, user)
+
+@router.post("/logout")
+async def logout(request: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """Revoke a refresh token; its access tokens expire on their own.
 
+    The row is deleted rather than marked revoked, so a stale retry of the
+    token is not mistaken for reuse of a rotated one. Rotated tokens are
+    kept, since replaying those is what reuse detection looks for.
+    """
+    payload = decode_refresh_token(request.refresh_token)
+    if payload is not None:
+        await db.execute(delete(RefreshToken).where(
+            RefreshToken.jti == payload["jti"],
+            RefreshToken.revoked_at.is_(None)
+        ))
+        await db.commit()
+    
+    return {"message": "Logged out successfully"}
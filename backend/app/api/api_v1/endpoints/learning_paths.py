@@ -1,27 +1,32 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import not_modified
 from app.core.deps import get_current_active_user
+from app.core.pagination import page_limit, paginate
 from app.db.database import get_db
 from app.models.user import User
 from app.models.topic import Topic
 from app.models.learning_path import LearningPath
+from app.models.path_progress import PathProgress
 from app.schemas.topic import LearningPath as LearningPathSchema, LearningPathCreate, LearningPathUpdate
+from app.services.path_progress import refresh_path_progress
 
 router = APIRouter()
 
 @router.post("/", response_model=LearningPathSchema)
-def create_learning_path(
+async def create_learning_path(
     learning_path_data: LearningPathCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Verify topic belongs to current user
-    topic = db.query(Topic).filter(
+    topic = await db.scalar(select(Topic).where(
         Topic.id == learning_path_data.topic_id,
         Topic.user_id == current_user.id
-    ).first()
+    ))
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
     
@@ -29,81 +34,111 @@ def create_learning_path(
         title=learning_path_data.title,
         description=learning_path_data.description,
         duration_weeks=learning_path_data.duration_weeks,
-        topic_id=learning_path_data.topic_id
+        topic_id=learning_path_data.topic_id,
+        owner_id=current_user.id
     )
     db.add(db_learning_path)
-    db.commit()
-    db.refresh(db_learning_path)
+    await db.flush()
+    await refresh_path_progress(db, [db_learning_path.id])
+    await db.commit()
+    await db.refresh(db_learning_path)
     
     return db_learning_path
 
 @router.get("/topic/{topic_id}", response_model=List[LearningPathSchema])
-def read_learning_paths_by_topic(
+async def read_learning_paths_by_topic(
     topic_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Verify topic belongs to current user
-    topic = db.query(Topic).filter(Topic.id == topic_id, Topic.user_id == current_user.id).first()
+    topic = await db.scalar(
+        select(Topic).where(Topic.id == topic_id, Topic.user_id == current_user.id)
+    )
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
     
-    learning_paths = db.query(LearningPath).filter(LearningPath.topic_id == topic_id).all()
-    return learning_paths
+    learning_paths = await paginate(
+        db,
+        select(LearningPath).where(LearningPath.topic_id == topic_id),
+        keys=[LearningPath.id],
+        cursor=cursor,
+        limit=limit,
+        response=response
+    )
+    return not_modified(request, response, learning_paths, page=True) or learning_paths
 
 @router.get("/{learning_path_id}", response_model=LearningPathSchema)
-def read_learning_path(
+async def read_learning_path(
     learning_path_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    learning_path = db.query(LearningPath).join(Topic).filter(
+    learning_path = await db.scalar(select(LearningPath).where(
         LearningPath.id == learning_path_id,
-        Topic.user_id == current_user.id
-    ).first()
+        LearningPath.owner_id == current_user.id
+    ))
     if not learning_path:
         raise HTTPException(status_code=404, detail="Learning path not found")
-    return learning_path
+    return not_modified(request, response, [learning_path]) or learning_path
 
 @router.put("/{learning_path_id}", response_model=LearningPathSchema)
-def update_learning_path(
+async def update_learning_path(
     learning_path_id: int,
     learning_path_update: LearningPathUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    learning_path = db.query(LearningPath).join(Topic).filter(
+    update_data = learning_path_update.dict(exclude_unset=True)
+    # Ownership-checked UPDATE ... RETURNING; no row back means no such path
+    statement = (
+        update(LearningPath).values(**update_data).returning(LearningPath)
+        if update_data else select(LearningPath)
+    )
+    learning_path = await db.scalar(statement.where(
         LearningPath.id == learning_path_id,
-        Topic.user_id == current_user.id
-    ).first()
+        LearningPath.owner_id == current_user.id
+    ))
     if not learning_path:
         raise HTTPException(status_code=404, detail="Learning path not found")
-    
-    update_data = learning_path_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(learning_path, field, value)
-    
-    db.add(learning_path)
-    db.commit()
-    db.refresh(learning_path)
+    await db.commit()
     
     return learning_path
 
 @router.delete("/{learning_path_id}")
-def delete_learning_path(
+async def delete_learning_path(
     learning_path_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    learning_path = db.query(LearningPath).join(Topic).filter(
-        LearningPath.id == learning_path_id,
-        Topic.user_id == current_user.id
-    ).first()
-    if not learning_path:
+    # Its summary goes first; the session rolls this back if the path stays
+    await db.execute(delete(PathProgress).where(
+        PathProgress.learning_path_id == learning_path_id,
+        PathProgress.user_id == current_user.id
+    ))
+    deleted_id = await db.scalar(
+        delete(LearningPath)
+        .where(
+            LearningPath.id == learning_path_id,
+            LearningPath.owner_id == current_user.id,
+            ~LearningPath.lessons.any()
+        )
+        .returning(LearningPath.id)
+    )
+    if deleted_id is None:
+        # Tell a missing path apart from one that still has lessons
+        if await db.scalar(select(LearningPath.id).where(
+            LearningPath.id == learning_path_id,
+            LearningPath.owner_id == current_user.id
+        )):
+            raise HTTPException(status_code=409, detail="Learning path still has lessons")
         raise HTTPException(status_code=404, detail="Learning path not found")
-    
-    db.delete(learning_path)
-    db.commit()
+    await db.commit()
     
     return {"message": "Learning path deleted successfully"}
-
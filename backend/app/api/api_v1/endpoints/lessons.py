@@ -1,28 +1,49 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import not_modified
 from app.core.deps import get_current_active_user
+from app.core.pagination import page_limit, paginate
 from app.db.database import get_db
 from app.models.user import User
-from app.models.topic import Topic
 from app.models.learning_path import LearningPath
 from app.models.lesson import Lesson
-from app.schemas.topic import Lesson as LessonSchema, LessonCreate, LessonUpdate
+from app.models.progress import Progress
+from app.schemas.topic import (
+    Lesson as LessonSchema, LessonCreate, LessonUpdate, LessonBulkUpdate, LessonBulkDelete, LessonSearchResult
+)
+from app.services.lesson_search import search_statement
+from app.services.path_progress import refresh_path_progress
+from app.services.progress_buffer import progress_buffer
 
 router = APIRouter()
 
+def lesson_unreferenced():
+    """Deletes must not leave videos pointing at a missing lesson"""
+    return ~Lesson.videos.any()
+
+def delete_lesson_progress(lesson_ids, owner_id: int):
+    """Progress on the owner's lessons, which goes with the lessons.
+
+    The caller's transaction must delete the lessons too, or roll back.
+    """
+    return delete(Progress).where(Progress.lesson_id.in_(
+        select(Lesson.id).where(Lesson.id.in_(lesson_ids), Lesson.owner_id == owner_id)
+    ))
+
 @router.post("/", response_model=LessonSchema)
-def create_lesson(
+async def create_lesson(
     lesson_data: LessonCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Verify learning path belongs to current user
-    learning_path = db.query(LearningPath).join(Topic).filter(
+    learning_path = await db.scalar(select(LearningPath).where(
         LearningPath.id == lesson_data.learning_path_id,
-        Topic.user_id == current_user.id
-    ).first()
+        LearningPath.owner_id == current_user.id
+    ))
     if not learning_path:
         raise HTTPException(status_code=404, detail="Learning path not found")
     
@@ -32,84 +53,226 @@ def create_lesson(
         script=lesson_data.script,
         week_number=lesson_data.week_number,
         day_number=lesson_data.day_number,
-        learning_path_id=lesson_data.learning_path_id
+        learning_path_id=lesson_data.learning_path_id,
+        owner_id=current_user.id
     )
     db.add(db_lesson)
-    db.commit()
-    db.refresh(db_lesson)
+    await db.flush()
+    await refresh_path_progress(db, [db_lesson.learning_path_id])
+    await db.commit()
+    await db.refresh(db_lesson)
     
     return db_lesson
 
+@router.post("/bulk", response_model=List[LessonSchema])
+async def create_lessons_bulk(
+    lessons_data: List[LessonCreate],
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many lessons with one ownership check and one INSERT"""
+    if not lessons_data:
+        return []
+    
+    # Verify every target learning path belongs to current user
+    learning_path_ids = {lesson.learning_path_id for lesson in lessons_data}
+    owned_ids = set(await db.scalars(select(LearningPath.id).where(
+        LearningPath.id.in_(learning_path_ids),
+        LearningPath.owner_id == current_user.id
+    )))
+    if owned_ids != learning_path_ids:
+        raise HTTPException(status_code=404, detail="Learning path not found")
+    
+    # Bulk INSERT skips ORM events, so owner_id is set here
+    lessons = await db.scalars(
+        insert(Lesson).returning(Lesson, sort_by_parameter_order=True),
+        [dict(lesson.dict(), owner_id=current_user.id) for lesson in lessons_data]
+    )
+    lessons = lessons.all()
+    await refresh_path_progress(db, learning_path_ids)
+    await db.commit()
+    
+    return lessons
+
+@router.patch("/bulk", response_model=List[LessonSchema])
+async def update_lessons_bulk(
+    lessons_update: List[LessonBulkUpdate],
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Apply partial updates to many lessons, matched by id, in one transaction"""
+    if not lessons_update:
+        return []
+    
+    lesson_ids = {lesson.id for lesson in lessons_update}
+    owned_ids = set(await db.scalars(select(Lesson.id).where(
+        Lesson.id.in_(lesson_ids),
+        Lesson.owner_id == current_user.id
+    )))
+    if owned_ids != lesson_ids:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    
+    # Rows with the same set of fields are sent as one executemany
+    await db.execute(
+        update(Lesson),
+        [lesson.dict(exclude_unset=True) for lesson in lessons_update]
+    )
+    await db.commit()
+    
+    lessons = await db.scalars(
+        select(Lesson)
+        .where(Lesson.id.in_(lesson_ids))
+        .order_by(Lesson.learning_path_id, Lesson.week_number, Lesson.day_number, Lesson.id)
+        .execution_options(populate_existing=True)
+    )
+    return lessons.all()
+
+@router.post("/bulk/delete")
+async def delete_lessons_bulk(
+    lessons_delete: LessonBulkDelete,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete many lessons; nothing is deleted unless all of them are found"""
+    lesson_ids = set(lessons_delete.ids)
+    await db.execute(delete_lesson_progress(lesson_ids, current_user.id))
+    deleted = (await db.execute(
+        delete(Lesson)
+        .where(
+            Lesson.id.in_(lesson_ids),
+            Lesson.owner_id == current_user.id,
+            lesson_unreferenced()
+        )
+        .returning(Lesson.id, Lesson.learning_path_id)
+    )).all()
+    deleted_ids = {lesson_id for lesson_id, _ in deleted}
+    if deleted_ids != lesson_ids:
+        await db.rollback()
+        owned_ids = set(await db.scalars(select(Lesson.id).where(
+            Lesson.id.in_(lesson_ids),
+            Lesson.owner_id == current_user.id
+        )))
+        if owned_ids == lesson_ids:
+            raise HTTPException(status_code=409, detail="Lesson still has videos")
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    await refresh_path_progress(db, {learning_path_id for _, learning_path_id in deleted})
+    await db.commit()
+    progress_buffer.discard(current_user.id, deleted_ids)
+    
+    return {"message": f"{len(deleted_ids)} lessons deleted successfully"}
+
 @router.get("/learning-path/{learning_path_id}", response_model=List[LessonSchema])
-def read_lessons_by_learning_path(
+async def read_lessons_by_learning_path(
     learning_path_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Verify learning path belongs to current user
-    learning_path = db.query(LearningPath).join(Topic).filter(
+    learning_path = await db.scalar(select(LearningPath).where(
         LearningPath.id == learning_path_id,
-        Topic.user_id == current_user.id
-    ).first()
+        LearningPath.owner_id == current_user.id
+    ))
     if not learning_path:
         raise HTTPException(status_code=404, detail="Learning path not found")
     
-    lessons = db.query(Lesson).filter(Lesson.learning_path_id == learning_path_id).all()
-    return lessons
+    # Schedule order, served from the (learning_path_id, week, day) index
+    lessons = await paginate(
+        db,
+        select(Lesson).where(Lesson.learning_path_id == learning_path_id),
+        keys=[Lesson.week_number, Lesson.day_number, Lesson.id],
+        cursor=cursor,
+        limit=limit,
+        response=response
+    )
+    return not_modified(request, response, lessons, page=True) or lessons
+
+@router.get("/search", response_model=List[LessonSearchResult])
+async def search_lessons(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over the current user's lessons, best matches first"""
+    statement, keys = search_statement(q, current_user.id)
+    if statement is None:
+        return []
+    
+    return await paginate(
+        db,
+        statement,
+        keys=keys,
+        cursor=cursor,
+        limit=limit,
+        response=response,
+        scalars=False
+    )
 
 @router.get("/{lesson_id}", response_model=LessonSchema)
-def read_lesson(
+async def read_lesson(
     lesson_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    lesson = db.query(Lesson).join(LearningPath).join(Topic).filter(
+    lesson = await db.scalar(select(Lesson).where(
         Lesson.id == lesson_id,
-        Topic.user_id == current_user.id
-    ).first()
+        Lesson.owner_id == current_user.id
+    ))
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    return lesson
+    return not_modified(request, response, [lesson]) or lesson
 
 @router.put("/{lesson_id}", response_model=LessonSchema)
-def update_lesson(
+async def update_lesson(
     lesson_id: int,
     lesson_update: LessonUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    lesson = db.query(Lesson).join(LearningPath).join(Topic).filter(
+    update_data = lesson_update.dict(exclude_unset=True)
+    # Ownership-checked UPDATE ... RETURNING; no row back means no such lesson
+    statement = update(Lesson).values(**update_data).returning(Lesson) if update_data else select(Lesson)
+    lesson = await db.scalar(statement.where(
         Lesson.id == lesson_id,
-        Topic.user_id == current_user.id
-    ).first()
+        Lesson.owner_id == current_user.id
+    ))
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    
-    update_data = lesson_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(lesson, field, value)
-    
-    db.add(lesson)
-    db.commit()
-    db.refresh(lesson)
+    await db.commit()
     
     return lesson
 
 @router.delete("/{lesson_id}")
-def delete_lesson(
+async def delete_lesson(
     lesson_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    lesson = db.query(Lesson).join(LearningPath).join(Topic).filter(
-        Lesson.id == lesson_id,
-        Topic.user_id == current_user.id
-    ).first()
-    if not lesson:
+    await db.execute(delete_lesson_progress([lesson_id], current_user.id))
+    learning_path_id = await db.scalar(
+        delete(Lesson)
+        .where(Lesson.id == lesson_id, Lesson.owner_id == current_user.id, lesson_unreferenced())
+        .returning(Lesson.learning_path_id)
+    )
+    if learning_path_id is None:
+        await db.rollback()
+        # Tell a missing lesson apart from one that videos refer to
+        if await db.scalar(select(Lesson.id).where(
+            Lesson.id == lesson_id,
+            Lesson.owner_id == current_user.id
+        )):
+            raise HTTPException(status_code=409, detail="Lesson still has videos")
         raise HTTPException(status_code=404, detail="Lesson not found")
-    
-    db.delete(lesson)
-    db.commit()
+    await refresh_path_progress(db, [learning_path_id])
+    await db.commit()
+    progress_buffer.discard(current_user.id, [lesson_id])
     
     return {"message": "Lesson deleted successfully"}
-
@@ -0,0 +1,94 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_current_active_user
+from app.core.pagination import page_limit, paginate
+from app.db.database import get_db
+from app.models.user import User
+from app.models.learning_path import LearningPath
+from app.models.lesson import Lesson
+from app.models.path_progress import PathProgress
+from app.models.progress import Progress
+from app.schemas.progress import LessonProgress, PathProgressSummary, ProgressHeartbeat
+from app.services.progress_buffer import progress_buffer
+
+router = APIRouter()
+
+@router.post("/heartbeat", status_code=status.HTTP_202_ACCEPTED)
+async def record_heartbeat(
+    heartbeat: ProgressHeartbeat,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Buffer a player progress report; it is written on the next flush"""
+    progress_buffer.record(current_user.id, heartbeat)
+    return {"message": "Progress accepted"}
+
+@router.get("/lesson/{lesson_id}", response_model=LessonProgress)
+async def read_lesson_progress(
+    lesson_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # Ownership check and stored progress in one query
+    row = (await db.execute(
+        select(Lesson.id, Progress)
+        .outerjoin(Progress, and_(
+            Progress.lesson_id == Lesson.id,
+            Progress.user_id == current_user.id
+        ))
+        .where(Lesson.id == lesson_id, Lesson.owner_id == current_user.id)
+    )).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    
+    _, progress = row
+    result = LessonProgress.model_validate(progress) if progress else LessonProgress(lesson_id=lesson_id)
+    # Heartbeats not flushed yet are newer than the stored row
+    pending = progress_buffer.pending(current_user.id, lesson_id)
+    if pending:
+        result.completion_percentage = pending["completion_percentage"]
+        result.completed = result.completed or pending["completed"]
+    return result
+
+@router.get("/learning-paths", response_model=List[PathProgressSummary])
+async def read_path_progress(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Completion summaries of the current user's learning paths"""
+    return await paginate(
+        db,
+        select(PathProgress).where(PathProgress.user_id == current_user.id),
+        keys=[PathProgress.learning_path_id],
+        cursor=cursor,
+        limit=limit,
+        response=response
+    )
+
+@router.get("/learning-path/{learning_path_id}", response_model=PathProgressSummary)
+async def read_learning_path_progress(
+    learning_path_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Completion summary of one learning path, read from its summary row"""
+    row = (await db.execute(
+        select(LearningPath.id, PathProgress)
+        .outerjoin(PathProgress, and_(
+            PathProgress.learning_path_id == LearningPath.id,
+            PathProgress.user_id == current_user.id
+        ))
+        .where(LearningPath.id == learning_path_id, LearningPath.owner_id == current_user.id)
+    )).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Learning path not found")
+    
+    _, summary = row
+    if summary is None:
+        return PathProgressSummary(learning_path_id=learning_path_id)
+    return summary
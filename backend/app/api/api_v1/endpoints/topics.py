@@ -1,20 +1,33 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.core.conditional import not_modified
 from app.core.deps import get_current_active_user
+from app.core.pagination import page_limit, paginate
 from app.db.database import get_db
 from app.models.user import User
 from app.models.topic import Topic
-from app.schemas.topic import Topic as TopicSchema, TopicCreate, TopicUpdate
+from app.models.learning_path import LearningPath
+from app.models.lesson import Lesson
+from app.models.progress import Progress
+from app.models.video import Video
+from app.schemas.progress import LessonProgress
+from app.schemas.topic import (
+    Topic as TopicSchema, TopicCreate, TopicUpdate,
+    LearningPath as LearningPathSchema, TopicTree, LearningPathTree, LessonTreeNode
+)
+from app.schemas.video import VideoStatus
 
 router = APIRouter()
 
 @router.post("/", response_model=TopicSchema)
-def create_topic(
+async def create_topic(
     topic_data: TopicCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     db_topic = Topic(
         title=topic_data.title,
@@ -22,65 +35,144 @@ def create_topic(
         user_id=current_user.id
     )
     db.add(db_topic)
-    db.commit()
-    db.refresh(db_topic)
+    await db.commit()
+    await db.refresh(db_topic)
     
     return db_topic
 
 @router.get("/", response_model=List[TopicSchema])
-def read_topics(
-    skip: int = 0,
-    limit: int = 100,
+async def read_topics(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    topics = db.query(Topic).filter(Topic.user_id == current_user.id).offset(skip).limit(limit).all()
-    return topics
+    topics = await paginate(
+        db,
+        select(Topic).where(Topic.user_id == current_user.id),
+        keys=[Topic.id],
+        cursor=cursor,
+        limit=limit,
+        response=response
+    )
+    return not_modified(request, response, topics, page=True) or topics
 
 @router.get("/{topic_id}", response_model=TopicSchema)
-def read_topic(
+async def read_topic(
     topic_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    topic = db.query(Topic).filter(Topic.id == topic_id, Topic.user_id == current_user.id).first()
+    topic = await db.scalar(
+        select(Topic).where(Topic.id == topic_id, Topic.user_id == current_user.id)
+    )
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
-    return topic
+    return not_modified(request, response, [topic]) or topic
 
-@router.put("/{topic_id}", response_model=TopicSchema)
-def update_topic(
+@router.get("/{topic_id}/tree", response_model=TopicTree)
+async def read_topic_tree(
     topic_id: int,
-    topic_update: TopicUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    topic = db.query(Topic).filter(Topic.id == topic_id, Topic.user_id == current_user.id).first()
+    """Topic with its learning paths, lessons, latest videos and progress.
+
+    Each level is loaded with one batched SELECT ... IN query, so the whole
+    course costs five queries however many paths and lessons it has.
+    """
+    latest_videos = (
+        select(func.max(Video.id))
+        .where(Video.owner_id == current_user.id)
+        .group_by(Video.lesson_id)
+    )
+    topic = await db.scalar(
+        select(Topic)
+        .where(Topic.id == topic_id, Topic.user_id == current_user.id)
+        .options(
+            selectinload(Topic.learning_paths)
+            .selectinload(LearningPath.lessons)
+            .load_only(Lesson.id, Lesson.title, Lesson.week_number, Lesson.day_number)
+            .options(
+                selectinload(Lesson.videos.and_(Video.id.in_(latest_videos))),
+                selectinload(Lesson.progress.and_(Progress.user_id == current_user.id))
+            )
+        )
+    )
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
     
-    update_data = topic_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(topic, field, value)
+    learning_paths = []
+    for learning_path in sorted(topic.learning_paths, key=lambda p: p.id):
+        lessons = sorted(
+            learning_path.lessons,
+            key=lambda l: (l.week_number, l.day_number, l.id)
+        )
+        learning_paths.append(LearningPathTree(
+            **LearningPathSchema.model_validate(learning_path).model_dump(),
+            lessons=[
+                LessonTreeNode(
+                    id=lesson.id,
+                    title=lesson.title,
+                    week_number=lesson.week_number,
+                    day_number=lesson.day_number,
+                    latest_video=VideoStatus.model_validate(lesson.videos[0]) if lesson.videos else None,
+                    progress=LessonProgress.model_validate(lesson.progress[0]) if lesson.progress else None
+                )
+                for lesson in lessons
+            ]
+        ))
     
-    db.add(topic)
-    db.commit()
-    db.refresh(topic)
+    return TopicTree(
+        **TopicSchema.model_validate(topic).model_dump(),
+        learning_paths=learning_paths
+    )
+
+@router.put("/{topic_id}", response_model=TopicSchema)
+async def update_topic(
+    topic_id: int,
+    topic_update: TopicUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    update_data = topic_update.dict(exclude_unset=True)
+    # Ownership-checked UPDATE ... RETURNING; no row back means no such topic
+    statement = update(Topic).values(**update_data).returning(Topic) if update_data else select(Topic)
+    topic = await db.scalar(
+        statement.where(Topic.id == topic_id, Topic.user_id == current_user.id)
+    )
+    if not topic:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    await db.commit()
     
     return topic
 
 @router.delete("/{topic_id}")
-def delete_topic(
+async def delete_topic(
     topic_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    topic = db.query(Topic).filter(Topic.id == topic_id, Topic.user_id == current_user.id).first()
-    if not topic:
+    deleted_id = await db.scalar(
+        delete(Topic)
+        .where(
+            Topic.id == topic_id,
+            Topic.user_id == current_user.id,
+            ~Topic.learning_paths.any()
+        )
+        .returning(Topic.id)
+    )
+    if deleted_id is None:
+        # Tell a missing topic apart from one that still has learning paths
+        if await db.scalar(
+            select(Topic.id).where(Topic.id == topic_id, Topic.user_id == current_user.id)
+        ):
+            raise HTTPException(status_code=409, detail="Topic still has learning paths")
         raise HTTPException(status_code=404, detail="Topic not found")
-    
-    db.delete(topic)
-    db.commit()
+    await db.commit()
     
     return {"message": "Topic deleted successfully"}
-
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_active_user
+from app.core.deps import get_current_active_user, principal_cache
 from app.db.database import get_db
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate
@@ -9,43 +10,56 @@ from app.schemas.user import User as UserSchema, UserUpdate
 router = APIRouter()
 
 @router.get("/me", response_model=UserSchema)
-def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 @router.put("/me", response_model=UserSchema)
-def update_user_me(
+async def update_user_me(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     update_data = user_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(current_user, field, value)
+    if not update_data:
+        return current_user
     
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    # One UPDATE ... RETURNING; bulk statements skip the ORM events that
+    # would otherwise invalidate the principal cache
+    user = await db.scalar(
+        update(User).where(User.id == current_user.id).values(**update_data).returning(User)
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.commit()
+    principal_cache.invalidate(user.email)
     
-    return current_user
+    return user
 
 @router.put("/me/preferences", response_model=UserSchema)
-def update_user_preferences(
+async def update_user_preferences(
     avatar_url: str = None,
     voice_id: str = None,
     voice_name: str = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
+    update_data = {}
     if avatar_url is not None:
-        current_user.avatar_url = avatar_url
+        update_data["avatar_url"] = avatar_url
     if voice_id is not None:
-        current_user.voice_id = voice_id
+        update_data["voice_id"] = voice_id
     if voice_name is not None:
-        current_user.voice_name = voice_name
+        update_data["voice_name"] = voice_name
+    if not update_data:
+        return current_user
     
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    user = await db.scalar(
+        update(User).where(User.id == current_user.id).values(**update_data).returning(User)
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.commit()
+    principal_cache.invalidate(user.email)
     
-    return current_user
+    return user
 
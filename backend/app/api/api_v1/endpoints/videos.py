@@ -1,82 +1,40 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, Form
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 import uuid
 
+from app.core.conditional import not_modified
 from app.core.deps import get_current_active_user
+from app.core.pagination import page_limit, paginate
 from app.db.database import get_db
 from app.models.user import User
-from app.models.topic import Topic
 from app.models.learning_path import LearningPath
 from app.models.lesson import Lesson
 from app.models.video import Video
-from app.services.video_service import video_service
+from app.models.video_batch import VideoBatch
+from app.models.video_job import VideoJob
+from app.schemas.video import VideoBatchCreate
+from app.services.job_queue import video_job_queue
 from app.core.config import settings
 
 router = APIRouter()
 
-async def generate_video_task(video_id: int, lesson_text: str, voice_id: str, avatar_path: str):
-    """Background task for video generation"""
-    from app.db.database import SessionLocal
-    
-    db = SessionLocal()
-    try:
-        video = db.query(Video).filter(Video.id == video_id).first()
-        if not video:
-            return
-        
-        # Generate unique filenames
-        audio_filename = f"{uuid.uuid4()}.mp3"
-        video_filename = f"{uuid.uuid4()}.mp4"
-        
-        audio_path = os.path.join(settings.UPLOAD_DIR, "audio", audio_filename)
-        video_path = os.path.join(settings.UPLOAD_DIR, "videos", video_filename)
-        
-        # Generate video
-        result = await video_service.generate_video_from_lesson(
-            lesson_text=lesson_text,
-            voice_id=voice_id,
-            avatar_image_path=avatar_path,
-            output_video_path=video_path,
-            output_audio_path=audio_path
-        )
-        
-        if result["success"]:
-            video.video_url = f"/uploads/videos/{video_filename}"
-            video.audio_url = f"/uploads/audio/{audio_filename}"
-            video.status = "completed"
-        else:
-            video.status = "failed"
-        
-        db.add(video)
-        db.commit()
-        
-    except Exception as e:
-        print(f"Video generation task failed: {e}")
-        video = db.query(Video).filter(Video.id == video_id).first()
-        if video:
-            video.status = "failed"
-            db.add(video)
-            db.commit()
-    finally:
-        db.close()
-
 @router.post("/generate", response_model=dict)
 async def generate_video(
     lesson_id: int = Form(...),
     voice_id: str = Form(None),
     avatar_file: UploadFile = File(None),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Generate video for a lesson"""
     # Verify lesson belongs to current user
-    lesson = db.query(Lesson).join(LearningPath).join(Topic).filter(
+    lesson = await db.scalar(select(Lesson).where(
         Lesson.id == lesson_id,
-        Topic.user_id == current_user.id
-    ).first()
+        Lesson.owner_id == current_user.id
+    ))
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
     
@@ -110,28 +68,26 @@ async def generate_video(
             detail="No avatar specified. Please upload an avatar or set a default avatar"
         )
     
-    # Create video record
+    # Create video record and queue its generation job in one transaction
     db_video = Video(
         title=f"Video for {lesson.title}",
         video_url="",  # Will be updated after generation
         lesson_id=lesson_id,
+        owner_id=current_user.id,
         voice_id=voice_id,
         avatar_url=avatar_path,
         status="processing"
     )
     db.add(db_video)
-    db.commit()
-    db.refresh(db_video)
-    
-    # Add background task for video generation
-    lesson_text = lesson.script or lesson.content
-    background_tasks.add_task(
-        generate_video_task, 
-        db_video.id, 
-        lesson_text, 
-        voice_id, 
-        avatar_path
+    video_job_queue.enqueue(
+        db,
+        db_video,
+        lesson_text=lesson.script or lesson.content,
+        voice_id=voice_id,
+        avatar_path=avatar_path
     )
+    await db.commit()
+    await db.refresh(db_video)
     
     return {
         "message": "Video generation started", 
@@ -139,22 +95,155 @@ async def generate_video(
         "status": "processing"
     }
 
+@router.post("/generate-batch", response_model=dict)
+async def generate_video_batch(
+    batch_data: VideoBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Generate videos for a whole learning path or a list of lessons.
+
+    All videos are queued in one transaction, in lesson order. Workers run
+    text-to-speech and lip-sync as separate stages, so the next lesson's
+    audio is produced while the current one is being rendered.
+    """
+    lesson_query = select(Lesson).where(Lesson.owner_id == current_user.id)
+    if batch_data.learning_path_id is not None:
+        learning_path = await db.scalar(select(LearningPath).where(
+            LearningPath.id == batch_data.learning_path_id,
+            LearningPath.owner_id == current_user.id
+        ))
+        if not learning_path:
+            raise HTTPException(status_code=404, detail="Learning path not found")
+        lesson_query = lesson_query.where(Lesson.learning_path_id == learning_path.id)
+    else:
+        lesson_query = lesson_query.where(Lesson.id.in_(batch_data.lesson_ids))
+    
+    lessons = (await db.scalars(
+        lesson_query.order_by(Lesson.week_number, Lesson.day_number, Lesson.id)
+    )).all()
+    if batch_data.lesson_ids and len(lessons) != len(set(batch_data.lesson_ids)):
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    if not lessons:
+        raise HTTPException(status_code=400, detail="No lessons to generate videos for")
+    
+    voice_id = batch_data.voice_id or current_user.voice_id
+    if not voice_id:
+        raise HTTPException(
+            status_code=400, 
+            detail="No voice specified. Please set a default voice or provide voice_id"
+        )
+    avatar_path = current_user.avatar_url
+    if not avatar_path:
+        raise HTTPException(
+            status_code=400,
+            detail="No avatar specified. Please set a default avatar"
+        )
+    
+    db_batch = VideoBatch(
+        user_id=current_user.id,
+        learning_path_id=batch_data.learning_path_id,
+        total_videos=len(lessons)
+    )
+    db.add(db_batch)
+    
+    videos = []
+    for lesson in lessons:
+        db_video = Video(
+            title=f"Video for {lesson.title}",
+            video_url="",  # Will be updated after generation
+            lesson_id=lesson.id,
+            owner_id=current_user.id,
+            batch=db_batch,
+            voice_id=voice_id,
+            avatar_url=avatar_path,
+            status="processing"
+        )
+        db.add(db_video)
+        video_job_queue.enqueue(
+            db,
+            db_video,
+            lesson_text=lesson.script or lesson.content,
+            voice_id=voice_id,
+            avatar_path=avatar_path
+        )
+        videos.append(db_video)
+    await db.commit()
+    
+    return {
+        "message": "Batch video generation started",
+        "batch_id": db_batch.id,
+        "video_ids": [video.id for video in videos],
+        "status": "processing"
+    }
+
+@router.get("/batches/{batch_id}", response_model=dict)
+async def get_video_batch(
+    batch_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get progress of a batch video generation"""
+    batch = await db.scalar(select(VideoBatch).where(
+        VideoBatch.id == batch_id,
+        VideoBatch.user_id == current_user.id
+    ))
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    counts = dict((await db.execute(
+        select(Video.status, func.count(Video.id))
+        .where(Video.batch_id == batch_id)
+        .group_by(Video.status)
+    )).all())
+    if counts.get("processing"):
+        batch_status = "processing"
+    elif counts.get("failed"):
+        batch_status = "failed" if not counts.get("completed") else "partially_failed"
+    else:
+        batch_status = "completed"
+    
+    return {
+        "batch_id": batch.id,
+        "learning_path_id": batch.learning_path_id,
+        "status": batch_status,
+        "total": batch.total_videos,
+        "processing": counts.get("processing", 0),
+        "completed": counts.get("completed", 0),
+        "failed": counts.get("failed", 0),
+        "created_at": batch.created_at
+    }
+
 @router.get("/lesson/{lesson_id}", response_model=List[dict])
-def get_videos_by_lesson(
+async def get_videos_by_lesson(
     lesson_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all videos for a specific lesson"""
     # Verify lesson belongs to current user
-    lesson = db.query(Lesson).join(LearningPath).join(Topic).filter(
+    lesson = await db.scalar(select(Lesson).where(
         Lesson.id == lesson_id,
-        Topic.user_id == current_user.id
-    ).first()
+        Lesson.owner_id == current_user.id
+    ))
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
     
-    videos = db.query(Video).filter(Video.lesson_id == lesson_id).all()
+    videos = await paginate(
+        db,
+        select(Video).where(Video.lesson_id == lesson_id),
+        keys=[Video.id],
+        cursor=cursor,
+        limit=limit,
+        response=response
+    )
+    cached = not_modified(request, response, videos, page=True)
+    if cached:
+        return cached
     return [
         {
             "id": video.id,
@@ -173,19 +262,24 @@ def get_videos_by_lesson(
     ]
 
 @router.get("/{video_id}", response_model=dict)
-def get_video(
+async def get_video(
     video_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get specific video details"""
-    video = db.query(Video).join(Lesson).join(LearningPath).join(Topic).filter(
+    video = await db.scalar(select(Video).where(
         Video.id == video_id,
-        Topic.user_id == current_user.id
-    ).first()
+        Video.owner_id == current_user.id
+    ))
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
+    cached = not_modified(request, response, [video])
+    if cached:
+        return cached
     return {
         "id": video.id,
         "title": video.title,
@@ -201,18 +295,24 @@ def get_video(
     }
 
 @router.delete("/{video_id}")
-def delete_video(
+async def delete_video(
     video_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a video"""
-    video = db.query(Video).join(Lesson).join(LearningPath).join(Topic).filter(
-        Video.id == video_id,
-        Topic.user_id == current_user.id
-    ).first()
+    owned_video = (Video.id == video_id, Video.owner_id == current_user.id)
+    # Its jobs go with it, as the ORM cascade would have done
+    await db.execute(delete(VideoJob).where(
+        VideoJob.video_id.in_(select(Video.id).where(*owned_video))
+    ))
+    video = (await db.execute(
+        delete(Video).where(*owned_video).returning(Video.video_url, Video.audio_url)
+    )).first()
     if not video:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Video not found")
+    await db.commit()
     
     # Delete video files
     if video.video_url and os.path.exists(video.video_url.replace("/uploads/", settings.UPLOAD_DIR + "/")):
@@ -221,8 +321,5 @@ def delete_video(
     if video.audio_url and os.path.exists(video.audio_url.replace("/uploads/", settings.UPLOAD_DIR + "/")):
         os.remove(video.audio_url.replace("/uploads/", settings.UPLOAD_DIR + "/"))
     
-    db.delete(video)
-    db.commit()
-    
     return {"message": "Video deleted successfully"}
 
@@ -1,11 +1,10 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 import os
 import uuid
 
 from app.core.deps import get_current_active_user
-from app.db.database import get_db
 from app.models.user import User
 from app.services.elevenlabs_service import elevenlabs_service
 from app.core.config import settings
@@ -86,11 +85,8 @@ async def generate_speech(
             detail="ElevenLabs API key not configured"
         )
     
-    if len(text) > 5000:
-        raise HTTPException(
-            status_code=400,
-            detail="Text is too long. Maximum 5000 characters allowed."
-        )
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Text must not be empty")
     
     # Generate unique filename
     audio_filename = f"{uuid.uuid4()}.mp3"
@@ -125,6 +121,64 @@ async def generate_speech(
         "voice_settings": voice_settings
     }
 
+@router.post("/generate-speech/stream")
+async def stream_speech(
+    text: str = Form(...),
+    voice_id: str = Form(...),
+    stability: float = Form(0.5),
+    similarity_boost: float = Form(0.5),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Stream speech to the client while it is being synthesized.
+
+    The audio is also saved; its URL is returned in the ``X-Audio-Url``
+    header and is available once the stream has finished.
+    """
+    if not settings.ELEVENLABS_API_KEY:
+        raise HTTPException(
+            status_code=503,
+            detail="ElevenLabs API key not configured"
+        )
+    
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Text must not be empty")
+    
+    audio_filename = f"{uuid.uuid4()}.mp3"
+    audio_path = os.path.join(settings.UPLOAD_DIR, "audio", audio_filename)
+    
+    audio_stream = elevenlabs_service.stream_speech(
+        text=text,
+        voice_id=voice_id,
+        output_path=audio_path,
+        voice_settings={
+            "stability": stability,
+            "similarity_boost": similarity_boost
+        }
+    )
+    
+    # Pull the first chunk here so upstream errors still become a 500
+    try:
+        first_chunk = await audio_stream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except Exception as e:
+        print(f"Error streaming speech: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to generate speech"
+        )
+    
+    async def audio_body():
+        yield first_chunk
+        async for chunk in audio_stream:
+            yield chunk
+    
+    return StreamingResponse(
+        audio_body(),
+        media_type="audio/mpeg",
+        headers={"X-Audio-Url": f"/uploads/audio/{audio_filename}"}
+    )
+
 @router.delete("/{voice_id}")
 async def delete_voice(
     voice_id: str,
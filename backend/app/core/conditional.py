@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional
+from fastapi import Request, Response
+from sqlalchemy import inspect
+
+# Browsers keep the body but revalidate it on every use, so an unchanged
+# resource costs a 304 instead of a full response
+CACHE_CONTROL = "private, no-cache"
+
+def entity_etag(entities: Iterable[Any]) -> str:
+    """Strong ETag over the column values of ``entities``, in order.
+
+    Hashing the stored values instead of only ``updated_at`` keeps the tag
+    correct when two writes land within the timestamp's one second
+    resolution, and it is still far cheaper than serializing the response.
+    """
+    digest = hashlib.sha1()
+    for entity in entities:
+        mapper = inspect(entity).mapper
+        digest.update(mapper.class_.__name__.encode("utf-8"))
+        for attr in mapper.column_attrs:
+            digest.update(b"\x1f")
+            digest.update(repr(getattr(entity, attr.key)).encode("utf-8"))
+        digest.update(b"\x1e")
+    return f'"{digest.hexdigest()}"'
+
+def last_modified(entities: Iterable[Any]) -> Optional[datetime]:
+    """Latest ``updated_at`` (or ``created_at``) of ``entities``, in UTC"""
+    latest = None
+    for entity in entities:
+        changed = getattr(entity, "updated_at", None) or getattr(entity, "created_at", None)
+        if changed is None:
+            continue
+        # SQLite hands back naive timestamps; CURRENT_TIMESTAMP is UTC
+        if changed.tzinfo is None:
+            changed = changed.replace(tzinfo=timezone.utc)
+        if latest is None or changed > latest:
+            latest = changed
+    return latest
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def _not_modified_since(if_modified_since: str, modified: Optional[datetime]) -> bool:
+    if modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second precision
+    return modified.replace(microsecond=0) <= since
+
+def not_modified(
+    request: Request, response: Response, entities: Iterable[Any], page: bool = False
+) -> Optional[Response]:
+    """Set validators for ``entities`` and answer a matching conditional GET.
+
+    ETag, Last-Modified and Cache-Control are put on ``response`` for the
+    normal 200. When the request's If-None-Match (or, without one,
+    If-Modified-Since) shows the client already has this version, a 304
+    carrying the same headers is returned; the endpoint should return it
+    as is and skip building its body.
+
+    Pass ``page=True`` for list pages. A page's newest timestamp does not
+    move when a row is deleted from it, so pages only get an ETag and
+    If-Modified-Since is ignored.
+    """
+    entities = list(entities)
+    etag = entity_etag(entities)
+    modified = None if page else last_modified(entities)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if modified is not None:
+        response.headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        matched = if_modified_since is not None and _not_modified_since(if_modified_since, modified)
+    if not matched:
+        return None
+    return Response(status_code=304, headers=dict(response.headers))
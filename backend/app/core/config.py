@@ -1,6 +1,5 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
-import os
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Lexora API"
@@ -9,23 +8,82 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./lexora.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # Seconds to wait for a free connection
+    
+    # List endpoints
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+    
+    # Lesson progress heartbeats
+    PROGRESS_FLUSH_INTERVAL: float = 5  # Seconds between write-behind flushes
+    PROGRESS_BUFFER_MAX_ENTRIES: int = 50000  # Pending (user, lesson) pairs before heartbeats get 503
+    PROGRESS_BUFFER_MAX_PER_USER: int = 100  # Pending lessons per user before their heartbeats get 429
+    
+    # SQLite profile, applied to every connection when DATABASE_URL is SQLite
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # OFF, NORMAL, FULL or EXTRA
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536  # Page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # Bytes of the file to memory-map, 0 disables
+    SQLITE_SINGLE_WRITER: bool = True  # Route writes through one connection per engine
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread or process
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # Waiting hashes before login/register return 503
+    PRINCIPAL_CACHE_TTL: float = 60  # Seconds an authenticated user is cached, 0 disables
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
     
     # ElevenLabs API
     ELEVENLABS_API_KEY: Optional[str] = None
+    VOICE_CACHE_TTL: float = 300  # Seconds the voice catalogue is served without refreshing
+    VOICE_CACHE_STALE_TTL: float = 3600  # Further seconds stale entries are served while refreshing
     
     # Hugging Face API
     HUGGINGFACE_API_KEY: Optional[str] = None
     SUPRATH_LIPSYNC_URL: str = "https://suprath-lipsync.hf.space/run/predict"
     
+    # Outbound HTTP (ElevenLabs and lip-sync clients)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True  # Used when the h2 package is installed
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    ELEVENLABS_TIMEOUT: float = 30.0  # Voice catalogue and account calls
+    ELEVENLABS_SYNTHESIS_TIMEOUT: float = 120.0  # Speech synthesis and voice cloning
+    LIPSYNC_TIMEOUT: float = 300.0
+    LIPSYNC_DOWNLOAD_TIMEOUT: float = 120.0
+    
     # File Upload
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
     
+    # Text-to-speech
+    TTS_CHUNK_MAX_CHARS: int = 2500  # Longer text is split and synthesized in parallel
+    TTS_CHUNK_PARALLELISM: int = 4  # Concurrent ElevenLabs requests per synthesis
+    
+    # Generated media caches (kept outside UPLOAD_DIR so they are not served)
+    CACHE_DIR: str = "cache"
+    TTS_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 1GB, 0 disables the cache
+    LIPSYNC_CACHE_MAX_BYTES: int = 5 * 1024 * 1024 * 1024  # 5GB, 0 disables the cache
+    
+    # Video generation queue
+    VIDEO_WORKERS_IN_API: bool = True  # Disable when running `python -m app.worker` separately
+    VIDEO_WORKER_CONCURRENCY: int = 4  # Max jobs in flight per worker pool
+    VIDEO_TTS_CONCURRENCY: int = 2  # Max concurrent text-to-speech stages
+    VIDEO_LIPSYNC_CONCURRENCY: int = 2  # Max concurrent lip-sync stages
+    VIDEO_JOB_LEASE_SECONDS: int = 120
+    VIDEO_JOB_POLL_INTERVAL: float = 2.0
+    VIDEO_JOB_MAX_ATTEMPTS: int = 3
+    VIDEO_JOB_RETRY_DELAY_SECONDS: int = 30
+    VIDEO_WORKER_DRAIN_SECONDS: int = 30  # Grace period for in-flight jobs on shutdown
+    
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173", "http://localhost:8080"]
     
@@ -1,14 +1,40 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from app.db.database import get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import verify_token
 from app.models.user import User
 
 security = HTTPBearer()
 
-def get_current_user(
-    db: Session = Depends(get_db),
+# Active users resolved from token subjects, so most authenticated requests
+# skip the user query. Entries are column snapshots, never live ORM objects.
+# Invalidation is per process; the TTL bounds staleness across processes.
+principal_cache = TTLCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES
+)
+
+def _snapshot_user(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+def _user_from_snapshot(snapshot: dict) -> User:
+    """Detached User that can be read, or added to a session and updated"""
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.invalidate(target.email)
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
     token = credentials.credentials
@@ -19,16 +45,22 @@ def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.query(User).filter(User.email == email).first()
+    snapshot = principal_cache.get(email)
+    if snapshot is not None:
+        return _user_from_snapshot(snapshot)
+    
+    user = await db.scalar(select(User).where(User.email == email))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if user.is_active:
+        principal_cache.set(email, _snapshot_user(user))
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
@@ -0,0 +1,81 @@
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Union
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import ColumnElement, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def page_limit(
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX)
+) -> int:
+    return limit
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+def _key_type(key: Union[InstrumentedAttribute, ColumnElement]) -> Optional[type]:
+    try:
+        return key.type.python_type
+    except NotImplementedError:
+        return None
+
+def _matches_key(value: Any, key: Union[InstrumentedAttribute, ColumnElement]) -> bool:
+    # bool is an int subclass, but never a valid key value
+    if isinstance(value, bool):
+        return False
+    expected = _key_type(key)
+    if expected is None:
+        return isinstance(value, (int, float, str))
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+def decode_cursor(cursor: str, keys: Sequence[Union[InstrumentedAttribute, ColumnElement]]) -> List[Any]:
+    """Values of ``keys`` encoded in ``cursor``; 400 unless they fit the keys' types"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except ValueError:
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != len(keys)
+        or not all(_matches_key(value, key) for value, key in zip(values, keys))
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+async def paginate(
+    db: AsyncSession,
+    statement: Select,
+    keys: Sequence[Union[InstrumentedAttribute, ColumnElement]],
+    cursor: Optional[str],
+    limit: int,
+    response: Response,
+    scalars: bool = True
+) -> list:
+    """Run ``statement`` one keyset page at a time.
+
+    Rows are ordered by ``keys``, which must end in a unique column, and
+    the page starts after the row encoded in ``cursor``. When more rows
+    follow, the cursor for the next page is sent in the X-Next-Cursor
+    header, so list responses keep their shape. With ``scalars=False``
+    whole rows are returned, and keys may be labelled expressions in the
+    select list.
+    """
+    if cursor:
+        after = decode_cursor(cursor, keys)
+        statement = statement.where(tuple_(*keys) > tuple_(*after))
+    result = await db.execute(statement.order_by(*keys).limit(limit + 1))
+    rows = (result.scalars() if scalars else result).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, key.key) for key in keys])
+    return rows
@@ -1,21 +1,190 @@
-from sqlalchemy import create_engine
+from typing import AsyncIterator, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql.dml import UpdateBase
 from app.core.config import settings
 
+# Async drivers for the sync URLs in DATABASE_URL
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# libpq sslmode values asyncpg understands as its ``ssl`` argument
+_ASYNCPG_SSL_MODES = ("disable", "allow", "prefer", "require", "verify-ca", "verify-full")
+
+def async_database_url(url: str) -> str:
+    """Same database as ``url``, addressed through its asyncio driver.
+
+    asyncpg rejects libpq's ``sslmode`` query parameter, so it is dropped
+    here and passed as ``ssl`` by ``async_connect_args`` instead.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    if backend == "postgresql":
+        parsed = parsed.difference_update_query(["sslmode"])
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def async_connect_args(url: str) -> dict:
+    """Driver arguments the async engine needs for ``url``"""
+    parsed = make_url(url)
+    sslmode = parsed.query.get("sslmode")
+    if parsed.get_backend_name() != "postgresql" or sslmode is None:
+        return {}
+    if sslmode not in _ASYNCPG_SSL_MODES:
+        raise ValueError(f"Unsupported sslmode {sslmode!r} in DATABASE_URL")
+    return {"ssl": sslmode}
+
+_url = make_url(settings.DATABASE_URL)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
+# In-memory databases live in a single connection, so there is nothing to pool
+_IS_FILE_DB = not IS_SQLITE or _url.database not in (None, "", ":memory:")
+SINGLE_WRITER = IS_SQLITE and _IS_FILE_DB and settings.SQLITE_SINGLE_WRITER
+
+def _pool_options(pool_size: int, max_overflow: int, is_async: bool = False) -> dict:
+    if not _IS_FILE_DB:
+        return {}
+    return {
+        # Explicit, since aiosqlite would otherwise open a connection per checkout
+        "poolclass": AsyncAdaptedQueuePool if is_async else QueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+def configure_sqlite(engine: Engine, writer: bool = False):
+    """Apply the SQLite profile to every new connection of ``engine``.
+
+    Writer connections open their transactions with BEGIN IMMEDIATE, so the
+    write lock is taken up front and waits on busy_timeout, instead of
+    failing when a deferred transaction tries to upgrade mid-way.
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        if writer:
+            # Let SQLAlchemy, not the driver, decide when transactions begin
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.close()
+
+    if writer:
+        @event.listens_for(engine, "begin")
+        def _on_begin(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+class RoutingSession(Session):
+    """Session that sends flushes and INSERT/UPDATE/DELETE to ``writer``.
+
+    Everything else runs on the session's regular bind. With a one
+    connection writer engine this serializes writes within the process
+    while reads proceed on the pooled connections; in WAL mode readers are
+    never blocked by the writer. Once a transaction has written, its later
+    reads stay on the writer too, so they see its own changes and never
+    wait on the read pool while holding the only writer connection.
+    """
+
+    def __init__(self, *args, writer: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+        self._writing = False
+        self._wrote = False
+
+    def _execute_internal(self, statement, *args, **kwargs):
+        # ORM bulk INSERT/UPDATE ask for a connection by mapper only, without
+        # the statement, so remember that a write statement is running
+        if self.writer is None or not isinstance(statement, UpdateBase):
+            return super()._execute_internal(statement, *args, **kwargs)
+        writing, self._writing = self._writing, True
+        try:
+            return super()._execute_internal(statement, *args, **kwargs)
+        finally:
+            self._writing = writing
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.writer is not None and (
+            self._wrote or self._flushing or self._writing or isinstance(clause, UpdateBase)
+        ):
+            self._wrote = True
+            return self.writer
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session._wrote = False
+
+# Sync engines for table creation, the video job queue and scripts
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    **_pool_options(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
 )
+write_engine = None
+if SINGLE_WRITER:
+    write_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        **_pool_options(1, 0)
+    )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    writer=write_engine,
+    autocommit=False,
+    autoflush=False,
+    bind=engine
+)
+
+# Async engines for request handlers, so queries are awaited on the event
+# loop and request concurrency is bounded by the connection pool
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    connect_args=async_connect_args(settings.DATABASE_URL),
+    **_pool_options(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, is_async=True)
+)
+async_write_engine = None
+if SINGLE_WRITER:
+    async_write_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        connect_args=async_connect_args(settings.DATABASE_URL),
+        **_pool_options(1, 0, is_async=True)
+    )
+
+if IS_SQLITE:
+    configure_sqlite(engine)
+    configure_sqlite(async_engine.sync_engine)
+    if SINGLE_WRITER:
+        configure_sqlite(write_engine, writer=True)
+        configure_sqlite(async_write_engine.sync_engine, writer=True)
+
+# Objects stay loaded after commit; lazy loads are not possible in async code
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    writer=async_write_engine.sync_engine if async_write_engine else None,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
+async def dispose_engines():
+    """Close pooled connections of the async engines"""
+    await async_engine.dispose()
+    if async_write_engine is not None:
+        await async_write_engine.dispose()
@@ -1,7 +1,74 @@
-from app.db.database import engine, Base
-from app.models import user, topic, learning_path, lesson, video, progress, asset
+import os
+from contextlib import contextmanager
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from app.db.database import IS_SQLITE, engine
+from app.models import user, topic, learning_path, lesson, video, video_batch, video_job, progress, path_progress, asset, refresh_token
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The migration matching the schema create_all used to build
+BASELINE_REVISION = "0001"
+
+# Arbitrary application-wide key for the PostgreSQL advisory lock
+MIGRATION_LOCK_KEY = 0x6C65786F7261
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    # Leave the application's logging setup alone
+    config.attributes["configure_logger"] = False
+    return config
+
+@contextmanager
+def _file_lock(path: str):
+    try:
+        import fcntl
+    except ImportError:
+        # No advisory file locks on this platform
+        yield
+        return
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+@contextmanager
+def migration_transaction():
+    """Transaction that no other process can be migrating alongside.
+
+    API workers, video workers and maintenance commands all call init_db on
+    start, and without a lock two of them could both see an old revision
+    and apply the same migration. PostgreSQL takes a transaction-scoped
+    advisory lock; SQLite, which has no such lock, holds a file lock next to
+    the database until the transaction has committed.
+    """
+    if not IS_SQLITE:
+        with engine.begin() as connection:
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            yield connection
+        return
+    database = engine.url.database
+    if database in (None, "", ":memory:"):
+        with engine.begin() as connection:
+            yield connection
+        return
+    with _file_lock(f"{database}.migrate.lock"), engine.begin() as connection:
+        yield connection
 
 def init_db():
-    """Create database tables"""
-    Base.metadata.create_all(bind=engine)
+    """Upgrade the database schema to the latest Alembic migration"""
+    config = alembic_config()
+    with migration_transaction() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "users" in tables and "alembic_version" not in tables:
+            # Database created by create_all before migrations existed
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
 
+if __name__ == "__main__":
+    init_db()
@@ -5,7 +5,15 @@ import os
 
 from app.core.config import settings
 from app.api.api_v1.api import api_router
+from app.core.deps import principal_cache
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import password_hasher
+from app.db.database import dispose_engines
 from app.db.init_db import init_db
+from app.services.elevenlabs_service import elevenlabs_service
+from app.services.progress_buffer import progress_buffer
+from app.services.video_service import video_service
+from app.services.video_worker import video_worker_pool
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -21,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],  # Lets browsers read cursors and validators
 )
 
 # Include API router
@@ -34,8 +43,23 @@ app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
+    """Initialize database, open upstream clients and start background workers"""
     init_db()
+    await progress_buffer.start()
+    await elevenlabs_service.startup()
+    await video_service.startup()
+    if settings.VIDEO_WORKERS_IN_API:
+        await video_worker_pool.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drain video jobs, flush buffered progress, then close upstream clients and the DB pool"""
+    await video_worker_pool.stop()
+    await progress_buffer.stop()
+    await elevenlabs_service.shutdown()
+    await video_service.shutdown()
+    password_hasher.shutdown()
+    await dispose_engines()
 
 @app.get("/")
 async def root():
@@ -43,5 +67,5 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "principal_cache": principal_cache.stats()}
 
@@ -0,0 +1,49 @@
+"""Repair commands for derived data.
+
+    python -m app.maintenance rebuild-path-progress
+    python -m app.maintenance rebuild-lesson-search
+
+Derived tables are kept current by the API as it writes; these recompute
+them from their sources after manual edits, restores or bugs.
+"""
+
+import argparse
+
+from app.db.database import SessionLocal
+from app.db.init_db import init_db
+from app.services.lesson_search import rebuild_lesson_search
+from app.services.path_progress import rebuild_path_progress
+
+def run_rebuild_path_progress(args):
+    db = SessionLocal()
+    try:
+        rows = rebuild_path_progress(db)
+    finally:
+        db.close()
+    print(f"Rebuilt {rows} learning path progress summaries")
+
+def run_rebuild_lesson_search(args):
+    db = SessionLocal()
+    try:
+        rebuild_lesson_search(db)
+    finally:
+        db.close()
+    print("Rebuilt the lesson search index")
+
+COMMANDS = {
+    "rebuild-path-progress": run_rebuild_path_progress,
+    "rebuild-lesson-search": run_rebuild_lesson_search,
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Lexora maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS), help="Command to run")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    init_db()
+    COMMANDS[args.command](args)
+
+if __name__ == "__main__":
+    main()
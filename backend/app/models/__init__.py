@@ -1,2 +1,4 @@
 # Database models
 
+# Registers the listeners that maintain owner_id on paths, lessons and videos
+from app.models import ownership  # noqa: F401
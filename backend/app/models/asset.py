@@ -13,7 +13,7 @@ class Asset(Base):
     file_size = Column(BigInteger, nullable=False)
     mime_type = Column(String, nullable=False)
     asset_type = Column(String, nullable=False)  # avatar, audio, video, image
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -10,7 +10,8 @@ class LearningPath(Base):
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     duration_weeks = Column(Integer, default=6)
-    topic_id = Column(Integer, ForeignKey("topics.id"), nullable=False)
+    topic_id = Column(Integer, ForeignKey("topics.id"), nullable=False, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Copy of topic.user_id
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class Lesson(Base):
     __tablename__ = "lessons"
+    __table_args__ = (
+        # Lessons of a path are listed in schedule order
+        Index("ix_lessons_learning_path_schedule", "learning_path_id", "week_number", "day_number"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -13,6 +17,7 @@ class Lesson(Base):
     week_number = Column(Integer, nullable=False)
     day_number = Column(Integer, nullable=False)
     learning_path_id = Column(Integer, ForeignKey("learning_paths.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Copy of the path's owner
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
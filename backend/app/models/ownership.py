@@ -0,0 +1,75 @@
+"""Keeps the denormalized ``owner_id`` columns in step with the hierarchy.
+
+Learning paths, lessons and videos carry the id of the user who owns their
+topic, so an ownership check is a primary-key lookup plus an ``owner_id``
+predicate instead of a join up to ``topics``. Rows inserted without an
+owner take their parent's, and moving a row to another parent (or a topic
+to another user) rewrites the owner of everything below it.
+"""
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import attributes
+from app.models.topic import Topic
+from app.models.learning_path import LearningPath
+from app.models.lesson import Lesson
+from app.models.video import Video
+
+def _changed(target, key: str) -> bool:
+    return attributes.get_history(target, key).has_changes()
+
+def _lesson_ids_of_paths(path_ids):
+    return select(Lesson.id).where(Lesson.learning_path_id.in_(path_ids))
+
+@event.listens_for(Topic, "before_update")
+def _topic_moved(mapper, connection, target):
+    if not _changed(target, "user_id"):
+        return
+    path_ids = select(LearningPath.id).where(LearningPath.topic_id == target.id)
+    connection.execute(
+        update(Video).where(Video.lesson_id.in_(_lesson_ids_of_paths(path_ids)))
+        .values(owner_id=target.user_id)
+    )
+    connection.execute(
+        update(Lesson).where(Lesson.learning_path_id.in_(path_ids)).values(owner_id=target.user_id)
+    )
+    connection.execute(
+        update(LearningPath).where(LearningPath.topic_id == target.id).values(owner_id=target.user_id)
+    )
+
+@event.listens_for(LearningPath, "before_insert")
+@event.listens_for(LearningPath, "before_update")
+def _learning_path_owner(mapper, connection, target):
+    moved = target.id is not None and _changed(target, "topic_id")
+    if target.owner_id is not None and not moved:
+        return
+    target.owner_id = connection.scalar(select(Topic.user_id).where(Topic.id == target.topic_id))
+    if moved:
+        connection.execute(
+            update(Video).where(Video.lesson_id.in_(_lesson_ids_of_paths([target.id])))
+            .values(owner_id=target.owner_id)
+        )
+        connection.execute(
+            update(Lesson).where(Lesson.learning_path_id == target.id).values(owner_id=target.owner_id)
+        )
+
+@event.listens_for(Lesson, "before_insert")
+@event.listens_for(Lesson, "before_update")
+def _lesson_owner(mapper, connection, target):
+    moved = target.id is not None and _changed(target, "learning_path_id")
+    if target.owner_id is not None and not moved:
+        return
+    target.owner_id = connection.scalar(
+        select(LearningPath.owner_id).where(LearningPath.id == target.learning_path_id)
+    )
+    if moved:
+        connection.execute(
+            update(Video).where(Video.lesson_id == target.id).values(owner_id=target.owner_id)
+        )
+
+@event.listens_for(Video, "before_insert")
+@event.listens_for(Video, "before_update")
+def _video_owner(mapper, connection, target):
+    moved = target.id is not None and _changed(target, "lesson_id")
+    if target.owner_id is not None and not moved:
+        return
+    target.owner_id = connection.scalar(select(Lesson.owner_id).where(Lesson.id == target.lesson_id))
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class PathProgress(Base):
+    """Per learning path completion summary for its owner.
+
+    Derived from lessons and progress rows; kept current by
+    app.services.path_progress whenever either changes.
+    """
+    __tablename__ = "path_progress"
+    __table_args__ = (
+        Index("uq_path_progress_user_path", "user_id", "learning_path_id", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    learning_path_id = Column(Integer, ForeignKey("learning_paths.id"), nullable=False, index=True)
+    lessons_completed = Column(Integer, nullable=False, default=0)
+    lessons_total = Column(Integer, nullable=False, default=0)
+    avg_completion = Column(Float, nullable=False, default=0)  # 0-100, lessons without progress count as 0
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,14 +1,17 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class Progress(Base):
     __tablename__ = "progress"
+    __table_args__ = (
+        Index("uq_progress_user_lesson", "user_id", "lesson_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False)
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False, index=True)
     completed = Column(Boolean, default=False)
     notes = Column(Text, nullable=True)
     completion_percentage = Column(Integer, default=0)  # 0-100
@@ -12,8 +12,10 @@ class Video(Base):
     audio_url = Column(String, nullable=True)
     transcript = Column(Text, nullable=True)
     duration = Column(Float, nullable=True)  # Duration in seconds
-    status = Column(String, default="processing")  # processing, completed, failed
-    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False)
+    status = Column(String, default="processing", index=True)  # processing, completed, failed
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False, index=True)
+    batch_id = Column(Integer, ForeignKey("video_batches.id"), nullable=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Copy of the lesson's owner
     
     # Generation metadata
     voice_id = Column(String, nullable=True)
@@ -25,4 +27,6 @@ class Video(Base):
     
     # Relationships
     lesson = relationship("Lesson", back_populates="videos")
+    batch = relationship("VideoBatch", back_populates="videos")
+    jobs = relationship("VideoJob", back_populates="video", cascade="all, delete-orphan")
 
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+
+class VideoJob(Base):
+    __tablename__ = "video_jobs"
+    __table_args__ = (
+        # Claiming and orphan recovery filter on status and stage
+        Index("ix_video_jobs_status_stage", "status", "stage"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    video_id = Column(Integer, ForeignKey("videos.id"), nullable=False, index=True)
+    stage = Column(String, nullable=False, default="tts")  # tts, lipsync
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    # Generation inputs, snapshotted when the job is enqueued
+    lesson_text = Column(Text, nullable=False)
+    voice_id = Column(String, nullable=False)
+    avatar_path = Column(String, nullable=False)
+    audio_path = Column(String, nullable=False)
+    video_path = Column(String, nullable=False)
+
+    # Claim and lease
+    worker_id = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    run_after = Column(DateTime(timezone=True), nullable=True)  # Retry backoff
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    video = relationship("Video", back_populates="jobs")
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, model_validator
+from typing import Optional
+from datetime import datetime
+
+class ProgressHeartbeat(BaseModel):
+    lesson_id: int
+    completion_percentage: int
+    completed: bool = False
+
+    @model_validator(mode="after")
+    def check_percentage(self):
+        if not 0 <= self.completion_percentage <= 100:
+            raise ValueError("completion_percentage must be between 0 and 100")
+        return self
+
+class PathProgressSummary(BaseModel):
+    learning_path_id: int
+    lessons_completed: int = 0
+    lessons_total: int = 0
+    avg_completion: float = 0
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class LessonProgress(BaseModel):
+    lesson_id: int
+    completed: bool = False
+    completion_percentage: int = 0
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
+from app.schemas.progress import LessonProgress
+from app.schemas.video import VideoStatus
 
 class TopicBase(BaseModel):
     title: str
@@ -67,6 +69,12 @@ class LessonUpdate(BaseModel):
     week_number: Optional[int] = None
     day_number: Optional[int] = None
 
+class LessonBulkUpdate(LessonUpdate):
+    id: int
+
+class LessonBulkDelete(BaseModel):
+    ids: List[int]
+
 class LessonInDBBase(LessonBase):
     id: int
     learning_path_id: int
@@ -79,3 +87,27 @@ class LessonInDBBase(LessonBase):
 class Lesson(LessonInDBBase):
     pass
 
+class LessonSearchResult(BaseModel):
+    id: int
+    title: str
+    learning_path_id: int
+    week_number: int
+    day_number: int
+    snippet: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class LessonTreeNode(BaseModel):
+    id: int
+    title: str
+    week_number: int
+    day_number: int
+    latest_video: Optional[VideoStatus] = None
+    progress: Optional[LessonProgress] = None
+
+class LearningPathTree(LearningPathInDBBase):
+    lessons: List[LessonTreeNode] = []
+
+class TopicTree(TopicInDBBase):
+    learning_paths: List[LearningPathTree] = []
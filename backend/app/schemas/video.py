@@ -0,0 +1,23 @@
+from pydantic import BaseModel, model_validator
+from typing import Optional, List
+from datetime import datetime
+
+class VideoBatchCreate(BaseModel):
+    learning_path_id: Optional[int] = None
+    lesson_ids: Optional[List[int]] = None
+    voice_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.learning_path_id is None) == (not self.lesson_ids):
+            raise ValueError("Provide either learning_path_id or lesson_ids")
+        return self
+
+class VideoStatus(BaseModel):
+    id: int
+    status: Optional[str] = None
+    video_url: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
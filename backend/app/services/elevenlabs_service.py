@@ -1,53 +1,135 @@
+import asyncio
 import os
-import httpx
+import re
 import aiofiles
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
+from app.core.cache import AsyncTTLCache
 from app.core.config import settings
+from app.services.file_cache import tts_cache
+from app.services.http_client import PooledHTTPService
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """Split text into chunks of at most ``max_chars``.
+
+    Chunks break at paragraph boundaries where possible, then at sentence
+    ends, and only cut inside a sentence (at whitespace) as a last resort.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    pieces = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # Each piece carries the separator that joins it to the previous one
+        separator = "\n\n"
+        for sentence in _SENTENCE_END.split(paragraph):
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                pieces.append((sentence[:cut], separator))
+                separator = " "
+                sentence = sentence[cut:].lstrip()
+            if sentence:
+                pieces.append((sentence, separator))
+                separator = " "
+
+    chunks = []
+    current = ""
+    for piece, separator in pieces:
+        if not current:
+            current = piece
+        elif len(current) + len(separator) + len(piece) <= max_chars:
+            current = f"{current}{separator}{piece}"
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _strip_id3(data: bytes, keep_header: bool, keep_trailer: bool) -> bytes:
+    """Drop ID3 tags so MP3 frames from several files can be concatenated"""
+    if not keep_header and data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        data = data[10 + size + footer:]
+    if not keep_trailer and len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+    return data
+
+def join_mp3_files(part_paths: List[str], output_path: str):
+    """Concatenate MP3 files frame-to-frame into ``output_path``"""
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    last = len(part_paths) - 1
+    with open(output_path, "wb") as out:
+        for i, part_path in enumerate(part_paths):
+            with open(part_path, "rb") as f:
+                out.write(_strip_id3(f.read(), keep_header=i == 0, keep_trailer=i == last))
+
+class ElevenLabsService(PooledHTTPService):
+    default_timeout = settings.ELEVENLABS_TIMEOUT
 
-class ElevenLabsService:
     def __init__(self):
+        super().__init__()
         self.api_key = settings.ELEVENLABS_API_KEY
         self.base_url = "https://api.elevenlabs.io/v1"
         self.headers = {
             "Accept": "application/json",
             "xi-api-key": self.api_key
         }
+        self.voice_cache = AsyncTTLCache(
+            ttl=settings.VOICE_CACHE_TTL,
+            stale_ttl=settings.VOICE_CACHE_STALE_TTL
+        )
 
     async def get_voices(self) -> List[Dict]:
-        """Get all available voices from ElevenLabs"""
+        """Get all available voices from ElevenLabs (cached)"""
         if not self.api_key:
             return []
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/voices",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("voices", [])
+            return await self.voice_cache.get("voices", self._fetch_voices)
         except Exception as e:
             print(f"Error fetching voices: {e}")
             return []
 
     async def get_voice_by_id(self, voice_id: str) -> Optional[Dict]:
-        """Get specific voice details by ID"""
+        """Get specific voice details by ID (cached)"""
         if not self.api_key:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/voices/{voice_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            return await self.voice_cache.get(
+                ("voice", voice_id), lambda: self._fetch_voice(voice_id)
+            )
         except Exception as e:
             print(f"Error fetching voice {voice_id}: {e}")
             return None
 
+    async def _fetch_voices(self) -> List[Dict]:
+        response = await self.client.get(
+            f"{self.base_url}/voices",
+            headers=self.headers
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data.get("voices", [])
+
+    async def _fetch_voice(self, voice_id: str) -> Dict:
+        response = await self.client.get(
+            f"{self.base_url}/voices/{voice_id}",
+            headers=self.headers
+        )
+        response.raise_for_status()
+        return response.json()
+
     async def clone_voice(self, name: str, description: str, files: List[bytes]) -> Optional[Dict]:
         """Clone a voice using uploaded audio files"""
         if not self.api_key:
@@ -64,15 +146,16 @@ class ElevenLabsService:
                 "description": description
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/voices/add",
-                    headers={"xi-api-key": self.api_key},
-                    data=data,
-                    files=files_data
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.client.post(
+                f"{self.base_url}/voices/add",
+                headers={"xi-api-key": self.api_key},
+                data=data,
+                files=files_data,
+                timeout=settings.ELEVENLABS_SYNTHESIS_TIMEOUT
+            )
+            response.raise_for_status()
+            self.voice_cache.invalidate()
+            return response.json()
         except Exception as e:
             print(f"Error cloning voice: {e}")
             return None
@@ -85,8 +168,13 @@ class ElevenLabsService:
         model_id: str = "eleven_monolingual_v1",
         voice_settings: Optional[Dict] = None
     ) -> bool:
-        """Generate speech from text using specified voice"""
-        if not self.api_key:
+        """Generate speech from text using specified voice.
+
+        Text longer than ``TTS_CHUNK_MAX_CHARS`` is split at paragraph and
+        sentence boundaries, the chunks are synthesized concurrently and the
+        resulting MP3s are joined into ``output_path``.
+        """
+        if not self.api_key or not text.strip():
             return False
         
         if voice_settings is None:
@@ -95,6 +183,53 @@ class ElevenLabsService:
                 "similarity_boost": 0.5
             }
         
+        chunks = split_text(text, settings.TTS_CHUNK_MAX_CHARS)
+        if len(chunks) <= 1:
+            return await self._synthesize(text, voice_id, output_path, model_id, voice_settings)
+        
+        cache_key = tts_cache.make_key(text, voice_id, model_id, voice_settings)
+        if await tts_cache.fetch(cache_key, output_path):
+            return True
+        
+        part_paths = [f"{output_path}.part{i}" for i in range(len(chunks))]
+        semaphore = asyncio.Semaphore(settings.TTS_CHUNK_PARALLELISM)
+        
+        async def synthesize_chunk(chunk: str, part_path: str) -> bool:
+            async with semaphore:
+                return await self._synthesize(chunk, voice_id, part_path, model_id, voice_settings)
+        
+        try:
+            results = await asyncio.gather(*[
+                synthesize_chunk(chunk, part_path)
+                for chunk, part_path in zip(chunks, part_paths)
+            ])
+            if not all(results):
+                return False
+            await asyncio.to_thread(join_mp3_files, part_paths, output_path)
+        except Exception as e:
+            print(f"Error generating chunked speech: {e}")
+            return False
+        finally:
+            for part_path in part_paths:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+        
+        await tts_cache.store(cache_key, output_path)
+        return True
+
+    async def _synthesize(
+        self,
+        text: str,
+        voice_id: str,
+        output_path: str,
+        model_id: str,
+        voice_settings: Dict
+    ) -> bool:
+        """Synthesize one request's worth of text, going through the TTS cache"""
+        cache_key = tts_cache.make_key(text, voice_id, model_id, voice_settings)
+        if await tts_cache.fetch(cache_key, output_path):
+            return True
+        
         try:
             data = {
                 "text": text,
@@ -102,41 +237,111 @@ class ElevenLabsService:
                 "voice_settings": voice_settings
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/text-to-speech/{voice_id}",
-                    headers={
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                        "xi-api-key": self.api_key
-                    },
-                    json=data
-                )
-                response.raise_for_status()
-                
-                # Save audio file
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                async with aiofiles.open(output_path, 'wb') as f:
-                    await f.write(response.content)
-                
-                return True
+            response = await self.client.post(
+                f"{self.base_url}/text-to-speech/{voice_id}",
+                headers={
+                    "Accept": "audio/mpeg",
+                    "Content-Type": "application/json",
+                    "xi-api-key": self.api_key
+                },
+                json=data,
+                timeout=settings.ELEVENLABS_SYNTHESIS_TIMEOUT
+            )
+            response.raise_for_status()
+            
+            # Save audio file
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            async with aiofiles.open(output_path, 'wb') as f:
+                await f.write(response.content)
+        
+            await tts_cache.store(cache_key, output_path)
+            return True
         except Exception as e:
             print(f"Error generating speech: {e}")
             return False
 
+    async def stream_speech(
+        self,
+        text: str,
+        voice_id: str,
+        output_path: str,
+        model_id: str = "eleven_monolingual_v1",
+        voice_settings: Optional[Dict] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield synthesized audio as ElevenLabs produces it.
+
+        The stream is teed to ``output_path`` and cached once complete.
+        Unlike the other methods this raises on upstream errors, so callers
+        can turn a failure before the first chunk into an error response.
+        """
+        if not text.strip():
+            raise ValueError("No text to synthesize")
+        
+        if voice_settings is None:
+            voice_settings = {
+                "stability": 0.5,
+                "similarity_boost": 0.5
+            }
+        
+        cache_key = tts_cache.make_key(text, voice_id, model_id, voice_settings)
+        if await tts_cache.fetch(cache_key, output_path):
+            async with aiofiles.open(output_path, 'rb') as f:
+                while chunk := await f.read(64 * 1024):
+                    yield chunk
+            return
+        
+        chunks = split_text(text, settings.TTS_CHUNK_MAX_CHARS)
+        # Each chunk is a complete MP3 with its own ID3 tags, so chunks are
+        # kept apart and joined like generate_speech does before caching
+        part_paths = [f"{output_path}.partial{i}" for i in range(len(chunks))]
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        try:
+            # Long text is streamed chunk after chunk, in order
+            for chunk_text, part_path in zip(chunks, part_paths):
+                async with aiofiles.open(part_path, 'wb') as out:
+                    async with self.client.stream(
+                        "POST",
+                        f"{self.base_url}/text-to-speech/{voice_id}/stream",
+                        headers={
+                            "Accept": "audio/mpeg",
+                            "Content-Type": "application/json",
+                            "xi-api-key": self.api_key
+                        },
+                        json={
+                            "text": chunk_text,
+                            "model_id": model_id,
+                            "voice_settings": voice_settings
+                        },
+                        timeout=settings.ELEVENLABS_SYNTHESIS_TIMEOUT
+                    ) as response:
+                        response.raise_for_status()
+                        async for data in response.aiter_bytes():
+                            await out.write(data)
+                            yield data
+            if len(part_paths) == 1:
+                os.replace(part_paths[0], output_path)
+            else:
+                await asyncio.to_thread(join_mp3_files, part_paths, output_path)
+        finally:
+            for part_path in part_paths:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+        
+        await tts_cache.store(cache_key, output_path)
+
     async def delete_voice(self, voice_id: str) -> bool:
         """Delete a cloned voice"""
         if not self.api_key:
             return False
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.base_url}/voices/{voice_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return True
+            response = await self.client.delete(
+                f"{self.base_url}/voices/{voice_id}",
+                headers=self.headers
+            )
+            response.raise_for_status()
+            self.voice_cache.invalidate()
+            return True
         except Exception as e:
             print(f"Error deleting voice {voice_id}: {e}")
             return False
@@ -147,13 +352,12 @@ class ElevenLabsService:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/user",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.client.get(
+                f"{self.base_url}/user",
+                headers=self.headers
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             print(f"Error fetching user info: {e}")
             return None
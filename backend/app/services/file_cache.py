@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from typing import Any
+from app.core.config import settings
+
+class FileCache:
+    """Content-addressed on-disk cache with size-bounded LRU eviction.
+
+    Entries are files named by a sha256 key. A hit refreshes the entry's
+    mtime, which is what eviction orders by, and materializes it at the
+    caller's path as a hard link (or a copy across filesystems), so deleting
+    the caller's file never touches the cache.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ""):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._evict_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable hash of JSON-serializable parts"""
+        payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    async def hash_file(path: str) -> str:
+        """sha256 of a file's contents, read in chunks off the event loop"""
+        def _hash():
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        return await asyncio.to_thread(_hash)
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}{self.suffix}")
+
+    async def fetch(self, key: str, dest_path: str) -> bool:
+        """Materialize a cached entry at ``dest_path``; False on a miss"""
+        if self.max_bytes <= 0:
+            return False
+        return await asyncio.to_thread(self._fetch, key, dest_path)
+
+    async def store(self, key: str, src_path: str):
+        """Add ``src_path`` to the cache under ``key`` and evict if over budget"""
+        if self.max_bytes <= 0:
+            return
+        try:
+            await asyncio.to_thread(self._store, key, src_path)
+        except OSError as e:
+            print(f"Error caching {src_path}: {e}")
+
+    def _fetch(self, key: str, dest_path: str) -> bool:
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+            os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+            self._link_or_copy(path, dest_path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            print(f"Error reading cache entry {key}: {e}")
+            return False
+
+    def _store(self, key: str, src_path: str):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        self._link_or_copy(src_path, tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits its budget"""
+        with self._evict_lock:
+            entries = []
+            total = 0
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".tmp"):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def _link_or_copy(src: str, dest: str):
+        if os.path.exists(dest):
+            os.remove(dest)
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copyfile(src, dest)
+
+# Create singleton instances
+tts_cache = FileCache(
+    os.path.join(settings.CACHE_DIR, "tts"),
+    settings.TTS_CACHE_MAX_BYTES,
+    suffix=".mp3"
+)
+lipsync_cache = FileCache(
+    os.path.join(settings.CACHE_DIR, "lipsync"),
+    settings.LIPSYNC_CACHE_MAX_BYTES,
+    suffix=".mp4"
+)
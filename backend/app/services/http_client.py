@@ -0,0 +1,50 @@
+from typing import Optional
+import httpx
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class PooledHTTPService:
+    """Base for services that talk to one upstream over a shared client.
+
+    The client keeps a pool of keep-alive connections (HTTP/2 when the
+    ``h2`` package is installed) and lives for the whole process: it is
+    opened in ``startup`` and closed in ``shutdown``, or created on first
+    use by scripts that skip the app lifespan.
+    """
+
+    default_timeout: float = 30.0
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._ensure_client()
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=settings.HTTP2_ENABLED and HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(self.default_timeout, connect=settings.HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+                )
+            )
+        return self._client
+
+    async def startup(self):
+        """Open the shared client"""
+        self._ensure_client()
+
+    async def shutdown(self):
+        """Close the shared client and its pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
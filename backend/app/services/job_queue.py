@@ -0,0 +1,220 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.video import Video
+from app.models.video_job import VideoJob
+
+STAGES = ("tts", "lipsync")
+
+class VideoJobQueue:
+    """Persistent queue of video generation jobs.
+
+    Jobs live in the ``video_jobs`` table so they survive restarts. A worker
+    claims a pending job with a conditional UPDATE, holds it under a lease
+    that it renews while working, and hands it to the next stage when done.
+    Jobs whose lease expires (the worker died) are put back in the queue.
+    """
+
+    def __init__(self):
+        self.lease_seconds = settings.VIDEO_JOB_LEASE_SECONDS
+        self.max_attempts = settings.VIDEO_JOB_MAX_ATTEMPTS
+        self.retry_delay = settings.VIDEO_JOB_RETRY_DELAY_SECONDS
+
+    def enqueue(
+        self,
+        db: Union[Session, AsyncSession],
+        video: Video,
+        lesson_text: str,
+        voice_id: str,
+        avatar_path: str
+    ) -> VideoJob:
+        """Add a job for ``video`` to the session; the caller commits"""
+        job = VideoJob(
+            video=video,
+            stage="tts",
+            status="pending",
+            attempts=0,
+            lesson_text=lesson_text,
+            voice_id=voice_id,
+            avatar_path=avatar_path,
+            audio_path=os.path.join(settings.UPLOAD_DIR, "audio", f"{uuid.uuid4()}.mp3"),
+            video_path=os.path.join(settings.UPLOAD_DIR, "videos", f"{uuid.uuid4()}.mp4")
+        )
+        db.add(job)
+        return job
+
+    def claim(self, stages: List[str], worker_id: str) -> Optional[VideoJob]:
+        """Claim the oldest runnable job in one of ``stages``.
+
+        Returns a detached, fully loaded job or None when the queue is empty.
+        """
+        db = SessionLocal()
+        try:
+            for _ in range(5):
+                now = datetime.utcnow()
+                job_id = db.query(VideoJob.id).filter(
+                    VideoJob.status == "pending",
+                    VideoJob.stage.in_(stages),
+                    or_(VideoJob.run_after.is_(None), VideoJob.run_after <= now)
+                ).order_by(VideoJob.id).limit(1).scalar()
+                if job_id is None:
+                    return None
+
+                # Only one worker can flip the row from pending to running
+                claimed = db.query(VideoJob).filter(
+                    VideoJob.id == job_id,
+                    VideoJob.status == "pending"
+                ).update({
+                    VideoJob.status: "running",
+                    VideoJob.worker_id: worker_id,
+                    VideoJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                    VideoJob.attempts: VideoJob.attempts + 1
+                }, synchronize_session=False)
+                db.commit()
+
+                if claimed:
+                    return db.query(VideoJob).filter(VideoJob.id == job_id).first()
+            return None
+        finally:
+            db.close()
+
+    def renew_lease(self, job_id: int, worker_id: str) -> bool:
+        """Extend the lease; False means the job is no longer ours"""
+        return self._update_owned(job_id, worker_id, {
+            VideoJob.lease_expires_at: datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+        })
+
+    def advance(self, job: VideoJob, worker_id: str, next_stage: str, video_values: dict) -> bool:
+        """Finish the current stage and queue the job for ``next_stage``"""
+        return self._update_owned(job.id, worker_id, {
+            VideoJob.stage: next_stage,
+            VideoJob.status: "pending",
+            VideoJob.attempts: 0,
+            VideoJob.worker_id: None,
+            VideoJob.lease_expires_at: None,
+            VideoJob.run_after: None
+        }, video_id=job.video_id, video_values=video_values)
+
+    def complete(self, job: VideoJob, worker_id: str, video_values: dict) -> bool:
+        """Finish the last stage and mark the video completed"""
+        return self._update_owned(job.id, worker_id, {
+            VideoJob.status: "completed",
+            VideoJob.worker_id: None,
+            VideoJob.lease_expires_at: None
+        }, video_id=job.video_id, video_values={**video_values, Video.status: "completed"})
+
+    def release(self, job_id: int, worker_id: str) -> bool:
+        """Hand an unfinished job back to the queue without counting the attempt"""
+        return self._update_owned(job_id, worker_id, {
+            VideoJob.status: "pending",
+            VideoJob.attempts: VideoJob.attempts - 1,
+            VideoJob.worker_id: None,
+            VideoJob.lease_expires_at: None
+        })
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; retry later or give up after max attempts.
+
+        Returns True when the job has failed permanently.
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(VideoJob).filter(
+                VideoJob.id == job_id,
+                VideoJob.worker_id == worker_id,
+                VideoJob.status == "running"
+            ).first()
+            if not job:
+                return False
+
+            job.last_error = error
+            job.worker_id = None
+            job.lease_expires_at = None
+            if job.attempts >= self.max_attempts:
+                job.status = "failed"
+                self._mark_video_failed(db, job.video_id)
+            else:
+                job.status = "pending"
+                job.run_after = datetime.utcnow() + timedelta(seconds=self.retry_delay * job.attempts)
+            db.add(job)
+            db.commit()
+            return job.status == "failed"
+        finally:
+            db.close()
+
+    def recover_orphans(self) -> int:
+        """Requeue running jobs whose lease has expired.
+
+        Also fails videos left in ``processing`` without any job, which is
+        what generation requests from before the queue existed look like.
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            orphans = db.query(VideoJob).filter(
+                VideoJob.status == "running",
+                VideoJob.lease_expires_at < now
+            ).all()
+            for job in orphans:
+                job.worker_id = None
+                job.lease_expires_at = None
+                if job.attempts >= self.max_attempts:
+                    job.status = "failed"
+                    job.last_error = "Lease expired"
+                    self._mark_video_failed(db, job.video_id)
+                else:
+                    job.status = "pending"
+                db.add(job)
+
+            stranded = db.query(Video).filter(
+                Video.status == "processing",
+                ~Video.jobs.any()
+            ).all()
+            for video in stranded:
+                video.status = "failed"
+                db.add(video)
+
+            db.commit()
+            return len(orphans)
+        finally:
+            db.close()
+
+    def _update_owned(
+        self,
+        job_id: int,
+        worker_id: str,
+        values: dict,
+        video_id: Optional[int] = None,
+        video_values: Optional[dict] = None
+    ) -> bool:
+        """Update a job only while ``worker_id`` still holds its lease"""
+        db = SessionLocal()
+        try:
+            updated = db.query(VideoJob).filter(
+                VideoJob.id == job_id,
+                VideoJob.worker_id == worker_id,
+                VideoJob.status == "running"
+            ).update(values, synchronize_session=False)
+            if updated and video_values:
+                db.query(Video).filter(Video.id == video_id).update(
+                    video_values, synchronize_session=False
+                )
+            db.commit()
+            return updated > 0
+        finally:
+            db.close()
+
+    def _mark_video_failed(self, db: Session, video_id: int):
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if video:
+            video.status = "failed"
+            db.add(video)
+
+# Create a singleton instance
+video_job_queue = VideoJobQueue()
@@ -0,0 +1,83 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import Float, Select, column, func, insert, literal_column, select, table, text
+from sqlalchemy.orm import Session
+from app.db.database import IS_SQLITE
+from app.models.lesson import Lesson
+
+# Relative weight of title, content, script and owner_id matches
+SQLITE_BM25_WEIGHTS = (10.0, 1.0, 0.5, 0.0)
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_TOKENS = 16
+# Snippets come from the content column (title=0, content=1, script=2)
+SQLITE_SNIPPET_COLUMN = 1
+
+# FTS5 index over lessons (SQLite), created by migration 0006. Kept in sync
+# by triggers on the lessons table, so bulk statements are covered too.
+# owner_id is indexed as a column so the owner filter runs inside FTS5.
+lessons_fts = table("lessons_fts", column("rowid"), column("lessons_fts"))
+
+# PostgreSQL keeps a generated tsvector column on lessons instead, which the
+# ORM model does not map
+POSTGRES_SEARCH_INDEX = "ix_lessons_search_vector"
+
+def fts5_query(terms: str, owner_id: int) -> Optional[str]:
+    """Match ``terms`` within one owner's lessons.
+
+    Every term is quoted so user input is matched as words, not FTS5 syntax,
+    and the terms are limited to the text columns so they never match the
+    indexed owner_id.
+    """
+    quoted = " ".join('"' + term.replace('"', '""') + '"' for term in terms.split())
+    if not quoted:
+        return None
+    return f'owner_id : "{int(owner_id)}" AND {{title content script}} : ({quoted})'
+
+def search_statement(terms: str, owner_id: int) -> Tuple[Optional[Select], List]:
+    """Ranked search over one user's lessons, and the keys to page it by.
+
+    Returns ``(None, [])`` when ``terms`` holds nothing to search for.
+    """
+    columns = (Lesson.id, Lesson.title, Lesson.learning_path_id, Lesson.week_number, Lesson.day_number)
+    if IS_SQLITE:
+        query = fts5_query(terms, owner_id)
+        if query is None:
+            return None, []
+        document = literal_column("lessons_fts")
+        # bm25 is lower for better matches, so ascending order ranks best first
+        rank = func.bm25(document, *SQLITE_BM25_WEIGHTS, type_=Float).label("rank")
+        snippet = func.snippet(
+            document, SQLITE_SNIPPET_COLUMN, SNIPPET_START, SNIPPET_END, "…", SNIPPET_TOKENS
+        ).label("snippet")
+        statement = (
+            select(*columns, rank, snippet)
+            .select_from(lessons_fts)
+            .join(Lesson, Lesson.id == lessons_fts.c.rowid)
+            .where(document.match(query), Lesson.owner_id == owner_id)
+        )
+    else:
+        if not terms.strip():
+            return None, []
+        document = literal_column("lessons.search_vector")
+        query = func.websearch_to_tsquery("english", terms)
+        # Negated so ascending order ranks best first, as on SQLite
+        rank = (-func.ts_rank_cd(document, query, type_=Float)).label("rank")
+        snippet = func.ts_headline(
+            "english",
+            func.concat_ws(" ", Lesson.title, Lesson.content, Lesson.script),
+            query,
+            f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords={SNIPPET_TOKENS}, MinWords=5"
+        ).label("snippet")
+        statement = (
+            select(*columns, rank, snippet)
+            .where(document.op("@@")(query), Lesson.owner_id == owner_id)
+        )
+    return statement, [rank, Lesson.id]
+
+def rebuild_lesson_search(db: Session):
+    """Rebuild the search index from the lessons table"""
+    if IS_SQLITE:
+        db.execute(insert(lessons_fts).values(lessons_fts="rebuild"))
+    else:
+        db.execute(text(f"REINDEX INDEX {POSTGRES_SEARCH_INDEX}"))
+    db.commit()
@@ -0,0 +1,85 @@
+from typing import Iterable, Optional
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.db.database import IS_SQLITE
+from app.models.learning_path import LearningPath
+from app.models.lesson import Lesson
+from app.models.path_progress import PathProgress
+from app.models.progress import Progress
+
+SUMMARY_COLUMNS = ["user_id", "learning_path_id", "lessons_total", "lessons_completed", "avg_completion"]
+
+def path_summaries(learning_path_ids: Optional[Iterable[int]] = None):
+    """Aggregate lessons and the owner's progress per learning path"""
+    statement = (
+        select(
+            LearningPath.owner_id,
+            LearningPath.id,
+            func.count(Lesson.id),
+            func.coalesce(func.sum(case((Progress.completed, 1), else_=0)), 0),
+            func.coalesce(func.avg(func.coalesce(Progress.completion_percentage, 0)), 0)
+        )
+        .select_from(LearningPath)
+        .outerjoin(Lesson, Lesson.learning_path_id == LearningPath.id)
+        .outerjoin(Progress, and_(
+            Progress.lesson_id == Lesson.id,
+            Progress.user_id == LearningPath.owner_id
+        ))
+        # Also keeps SQLite from reading the upsert's ON CONFLICT as a join constraint
+        .where(LearningPath.owner_id.is_not(None))
+        .group_by(LearningPath.id, LearningPath.owner_id)
+    )
+    if learning_path_ids is not None:
+        statement = statement.where(LearningPath.id.in_(learning_path_ids))
+    return statement
+
+def upsert_path_progress(summaries):
+    """INSERT ... SELECT of ``summaries`` that overwrites existing rows"""
+    insert = sqlite_insert if IS_SQLITE else postgresql_insert
+    statement = insert(PathProgress).from_select(SUMMARY_COLUMNS, summaries)
+    return statement.on_conflict_do_update(
+        index_elements=[PathProgress.user_id, PathProgress.learning_path_id],
+        set_={
+            "lessons_total": statement.excluded.lessons_total,
+            "lessons_completed": statement.excluded.lessons_completed,
+            "avg_completion": statement.excluded.avg_completion,
+            "updated_at": func.now(),
+        }
+    )
+
+async def refresh_path_progress(db: AsyncSession, learning_path_ids: Iterable[int]):
+    """Recompute the summaries of the given paths in the caller's transaction.
+
+    Only the touched paths are aggregated, through the lesson schedule and
+    progress indexes, so the cost is bounded by those paths' lessons and
+    dashboard reads stay a single-row lookup.
+
+    On PostgreSQL the paths are locked first. Under READ COMMITTED two
+    transactions could otherwise aggregate before either commits, and the
+    later upsert would overwrite the summary with a count that misses the
+    other's writes. Once the lock is held, the aggregate's fresh snapshot
+    includes everything committed by earlier holders. SQLite already
+    serializes writing transactions.
+    """
+    learning_path_ids = sorted(set(learning_path_ids))
+    if not learning_path_ids:
+        return
+    if not IS_SQLITE:
+        # In id order, so transactions touching several paths cannot deadlock
+        await db.execute(
+            select(LearningPath.id)
+            .where(LearningPath.id.in_(learning_path_ids))
+            .order_by(LearningPath.id)
+            .with_for_update()
+        )
+    await db.execute(upsert_path_progress(path_summaries(learning_path_ids)))
+
+def rebuild_path_progress(db: Session) -> int:
+    """Recompute every summary from scratch; returns the number of rows"""
+    db.execute(delete(PathProgress))
+    db.execute(upsert_path_progress(path_summaries()))
+    db.commit()
+    return db.scalar(select(func.count()).select_from(PathProgress))
@@ -0,0 +1,158 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, IS_SQLITE
+from app.models.lesson import Lesson
+from app.models.progress import Progress
+from app.schemas.progress import ProgressHeartbeat
+from app.services.path_progress import refresh_path_progress
+
+# Rows per upsert statement, well under SQLite's bound parameter limit
+FLUSH_CHUNK_SIZE = 500
+
+class ProgressBuffer:
+    """Write-behind buffer for lesson progress heartbeats.
+
+    A heartbeat only replaces the in-memory entry for its (user_id,
+    lesson_id), so players reporting every few seconds cost no database
+    work per request. Every ``flush_interval`` seconds the latest entry of
+    each pair is written with bulk upserts in one transaction, along with
+    the summaries of the learning paths they touch. Ownership is
+    checked at flush time, where entries for lessons the user does not own
+    are dropped; until then ``max_per_user`` bounds how much of the buffer
+    one user can hold. Entries are per process; a crash loses at most one
+    interval of progress.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = settings.PROGRESS_FLUSH_INTERVAL,
+        max_entries: int = settings.PROGRESS_BUFFER_MAX_ENTRIES,
+        max_per_user: int = settings.PROGRESS_BUFFER_MAX_PER_USER
+    ):
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        self.max_per_user = max_per_user
+        self._pending: Dict[Tuple[int, int], dict] = {}
+        self._per_user: Dict[int, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, user_id: int, heartbeat: ProgressHeartbeat):
+        """Coalesce a heartbeat into the pending entry for its lesson"""
+        key = (user_id, heartbeat.lesson_id)
+        entry = self._pending.get(key)
+        retry_after = {"Retry-After": str(max(int(self.flush_interval), 1))}
+        if entry is None and self._per_user.get(user_id, 0) >= self.max_per_user:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many lessons with pending progress, please retry shortly",
+                headers=retry_after,
+            )
+        if entry is None and len(self._pending) >= self.max_entries:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many progress updates, please retry shortly",
+                headers=retry_after,
+            )
+        if entry is None:
+            self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        self._pending[key] = {
+            "user_id": user_id,
+            "lesson_id": heartbeat.lesson_id,
+            "completion_percentage": heartbeat.completion_percentage,
+            # Once completed, a lesson stays completed
+            "completed": heartbeat.completed or (entry is not None and entry["completed"]),
+        }
+
+    def discard(self, user_id: int, lesson_ids: Iterable[int]):
+        """Drop buffered entries for lessons that no longer exist"""
+        for lesson_id in lesson_ids:
+            if self._pending.pop((user_id, lesson_id), None) is not None:
+                self._per_user[user_id] -= 1
+
+    def pending(self, user_id: int, lesson_id: int) -> Optional[dict]:
+        """Buffered entry not yet written to the database, if any"""
+        entry = self._pending.get((user_id, lesson_id))
+        return dict(entry) if entry is not None else None
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop(), name="progress-flush")
+
+    async def stop(self):
+        """Stop the periodic flush and write out whatever is still buffered"""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write all pending entries; returns the number of rows upserted"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending, self._per_user = self._pending, {}, {}
+            try:
+                return await self._write(list(batch.values()))
+            except Exception as e:
+                print(f"Error flushing lesson progress: {e}")
+                # Retry on the next flush, unless a newer heartbeat replaced the entry
+                for key, entry in batch.items():
+                    if key not in self._pending:
+                        self._pending[key] = entry
+                        self._per_user[key[0]] = self._per_user.get(key[0], 0) + 1
+                return 0
+
+    async def _flush_loop(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def _write(self, entries: List[dict]) -> int:
+        insert = sqlite_insert if IS_SQLITE else postgresql_insert
+        # updated_at has no server default, so new rows set it explicitly
+        statement = insert(Progress).values(updated_at=func.now())
+        statement = statement.on_conflict_do_update(
+            index_elements=[Progress.user_id, Progress.lesson_id],
+            set_={
+                "completion_percentage": statement.excluded.completion_percentage,
+                "completed": or_(Progress.completed, statement.excluded.completed),
+                "updated_at": func.now(),
+            }
+        )
+        written = 0
+        async with AsyncSessionLocal() as db:
+            for start in range(0, len(entries), FLUSH_CHUNK_SIZE):
+                chunk = entries[start:start + FLUSH_CHUNK_SIZE]
+                lessons = await db.execute(
+                    select(Lesson.id, Lesson.owner_id, Lesson.learning_path_id)
+                    .where(Lesson.id.in_({entry["lesson_id"] for entry in chunk}))
+                )
+                owned = {
+                    (lesson_id, owner_id): learning_path_id
+                    for lesson_id, owner_id, learning_path_id in lessons
+                }
+                rows = [entry for entry in chunk if (entry["lesson_id"], entry["user_id"]) in owned]
+                if rows:
+                    await db.execute(statement, rows)
+                    await refresh_path_progress(
+                        db, {owned[(row["lesson_id"], row["user_id"])] for row in rows}
+                    )
+                    written += len(rows)
+            await db.commit()
+        return written
+
+# Create a singleton instance
+progress_buffer = ProgressBuffer()
@@ -1,12 +1,76 @@
+import asyncio
 import os
-import httpx
 import aiofiles
 import base64
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, List, Optional, Union
 from app.core.config import settings
+from app.services.file_cache import lipsync_cache
+from app.services.http_client import PooledHTTPService
+
+# Multiple of 3 so every chunk except the last encodes without padding
+_B64_READ_SIZE = 3 * 64 * 1024
+_B64_DECODE_SIZE = 4 * 64 * 1024
+
+def _b64_length(size: int) -> int:
+    return 4 * ((size + 2) // 3)
+
+async def _stream_json_body(parts: List[Union[bytes, str]]) -> AsyncIterator[bytes]:
+    """Yield literal byte parts as-is and file path parts as base64"""
+    for part in parts:
+        if isinstance(part, bytes):
+            yield part
+            continue
+        async with aiofiles.open(part, 'rb') as f:
+            while chunk := await f.read(_B64_READ_SIZE):
+                yield base64.b64encode(chunk)
+
+def _extract_video_result(response_path: str, output_path: str) -> Optional[str]:
+    """Pull the first ``data`` entry out of a spooled lip-sync response.
+
+    A base64 data URL is decoded chunk by chunk into ``output_path`` and
+    None is returned; an http(s) URL is returned for the caller to download.
+    Anything else raises ValueError.
+    """
+    with open(response_path, 'rb') as f:
+        head = f.read(_B64_DECODE_SIZE)
+        key = head.find(b'"data"')
+        bracket = head.find(b'[', key)
+        quote = head.find(b'"', bracket)
+        if key < 0 or bracket < 0 or quote < 0:
+            raise ValueError("Lip-sync response has no video data")
+        start = quote + 1
+        
+        if head.startswith(b'http', start):
+            end = head.find(b'"', start)
+            return head[start:end].decode('utf-8').replace('\\/', '/')
+        if not head.startswith(b'data:video', start):
+            raise ValueError("Unexpected lip-sync result format")
+        
+        comma = head.find(b',', start)
+        f.seek(comma + 1)
+        pending = b""
+        with open(output_path, 'wb') as out:
+            while True:
+                chunk = f.read(_B64_DECODE_SIZE)
+                end = chunk.find(b'"')
+                if end >= 0:
+                    chunk = chunk[:end]
+                # JSON encoders may escape "/" as "\/"
+                pending += chunk.replace(b'\\', b'')
+                usable = len(pending) - len(pending) % 4
+                out.write(base64.b64decode(pending[:usable]))
+                pending = pending[usable:]
+                if end >= 0 or not chunk:
+                    break
+            if pending:
+                out.write(base64.b64decode(pending + b'=' * (-len(pending) % 4)))
+    return None
+
+class VideoGenerationService(PooledHTTPService):
+    default_timeout = settings.LIPSYNC_TIMEOUT
 
-class VideoGenerationService:
     def __init__(self):
+        super().__init__()
         self.api_key = settings.HUGGINGFACE_API_KEY
         self.suprath_url = settings.SUPRATH_LIPSYNC_URL
         self.headers = {
@@ -14,79 +78,111 @@ class VideoGenerationService:
             "Content-Type": "application/json"
         }
 
+    async def lipsync_cache_key(self, audio_path: str, image_path: str) -> Optional[str]:
+        """Render cache key from the audio and avatar contents, None if unreadable"""
+        try:
+            audio_hash = await lipsync_cache.hash_file(audio_path)
+            image_hash = await lipsync_cache.hash_file(image_path)
+        except OSError:
+            return None
+        return lipsync_cache.make_key(self.suprath_url, audio_hash, image_hash)
+
+    async def fetch_cached_lipsync_video(
+        self,
+        audio_path: str,
+        image_path: str,
+        output_path: str
+    ) -> bool:
+        """Reuse an earlier render of the same audio and avatar, if any"""
+        cache_key = await self.lipsync_cache_key(audio_path, image_path)
+        return cache_key is not None and await lipsync_cache.fetch(cache_key, output_path)
+
     async def generate_lipsync_video(
         self, 
         audio_path: str, 
         image_path: str, 
         output_path: str
     ) -> bool:
-        """Generate lip-sync video using Suprath-lipsync API"""
+        """Generate lip-sync video using Suprath-lipsync API.
+
+        Renders are cached by the content hashes of the audio and avatar, so
+        the same pair is never sent to the lip-sync service twice.
+        """
+        cache_key = await self.lipsync_cache_key(audio_path, image_path)
+        if cache_key and await lipsync_cache.fetch(cache_key, output_path):
+            return True
+        
         if not self.api_key:
             print("Hugging Face API key not configured")
             return False
         
+        success = await self._render_lipsync_video(audio_path, image_path, output_path)
+        if success and cache_key:
+            await lipsync_cache.store(cache_key, output_path)
+        return success
+
+    async def _render_lipsync_video(
+        self,
+        audio_path: str,
+        image_path: str,
+        output_path: str
+    ) -> bool:
+        """Render via the lip-sync API using bounded memory.
+
+        The JSON request body is base64-encoded from disk as it is sent, the
+        response is spooled to a file, and the video is decoded or
+        downloaded from that file straight to ``output_path``.
+        """
+        response_path = f"{output_path}.response"
         try:
-            # Read and encode files
-            async with aiofiles.open(audio_path, 'rb') as f:
-                audio_content = await f.read()
-                audio_b64 = base64.b64encode(audio_content).decode('utf-8')
+            parts = [
+                b'{"data": ["data:audio/wav;base64,',
+                audio_path,
+                b'", "data:image/jpeg;base64,',
+                image_path,
+                b'"]}'
+            ]
+            content_length = sum(
+                len(part) if isinstance(part, bytes) else _b64_length(os.path.getsize(part))
+                for part in parts
+            )
+            headers = {**self.headers, "Content-Length": str(content_length)}
             
-            async with aiofiles.open(image_path, 'rb') as f:
-                image_content = await f.read()
-                image_b64 = base64.b64encode(image_content).decode('utf-8')
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            async with self.client.stream(
+                "POST",
+                self.suprath_url,
+                headers=headers,
+                content=_stream_json_body(parts)
+            ) as response:
+                response.raise_for_status()
+                async with aiofiles.open(response_path, 'wb') as f:
+                    async for data in response.aiter_bytes():
+                        await f.write(data)
             
-            # Prepare request data
-            data = {
-                "data": [
-                    f"data:audio/wav;base64,{audio_b64}",
-                    f"data:image/jpeg;base64,{image_b64}"
-                ]
-            }
+            # Check if generation was successful
+            video_url = await asyncio.to_thread(_extract_video_result, response_path, output_path)
+            if video_url is None:
+                return os.path.exists(output_path)
+            
+            # If it's a URL, download the video
+            async with self.client.stream(
+                "GET", video_url, timeout=settings.LIPSYNC_DOWNLOAD_TIMEOUT
+            ) as video_response:
+                video_response.raise_for_status()
+                async with aiofiles.open(output_path, 'wb') as f:
+                    async for data in video_response.aiter_bytes():
+                        await f.write(data)
+            return True
             
-            # Make API request
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                response = await client.post(
-                    self.suprath_url,
-                    headers=self.headers,
-                    json=data
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Check if generation was successful
-                if "data" in result and len(result["data"]) > 0:
-                    video_data = result["data"][0]
-                    
-                    # If video_data is a base64 string, decode and save
-                    if isinstance(video_data, str) and video_data.startswith("data:video"):
-                        # Extract base64 data
-                        video_b64 = video_data.split(",")[1]
-                        video_bytes = base64.b64decode(video_b64)
-                        
-                        # Save video file
-                        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                        async with aiofiles.open(output_path, 'wb') as f:
-                            await f.write(video_bytes)
-                        
-                        return True
-                    elif isinstance(video_data, str) and video_data.startswith("http"):
-                        # If it's a URL, download the video
-                        async with httpx.AsyncClient() as download_client:
-                            video_response = await download_client.get(video_data)
-                            video_response.raise_for_status()
-                            
-                            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                            async with aiofiles.open(output_path, 'wb') as f:
-                                await f.write(video_response.content)
-                            
-                            return True
-                
-                return False
-                
         except Exception as e:
             print(f"Error generating lip-sync video: {e}")
+            if os.path.exists(output_path):
+                os.remove(output_path)
             return False
+        finally:
+            if os.path.exists(response_path):
+                os.remove(response_path)
 
     async def generate_video_from_lesson(
         self,
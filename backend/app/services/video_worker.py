@@ -0,0 +1,196 @@
+import asyncio
+import os
+import socket
+import uuid
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.models.video_job import VideoJob
+from app.services.elevenlabs_service import elevenlabs_service
+from app.services.job_queue import video_job_queue, STAGES
+from app.services.video_service import video_service
+
+def upload_url(path: str) -> str:
+    """Public URL for a file stored under the upload directory"""
+    relative = os.path.relpath(path, settings.UPLOAD_DIR).replace(os.sep, "/")
+    return f"/uploads/{relative}"
+
+class VideoWorkerPool:
+    """Bounded pool of asyncio workers draining the video job queue.
+
+    At most ``concurrency`` jobs run at once, and each stage has its own
+    limit so slow lip-sync renders cannot starve text-to-speech (and vice
+    versa). While lesson N is in lip-sync, lesson N+1 can already be in TTS.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.VIDEO_WORKER_CONCURRENCY,
+        stage_limits: Optional[Dict[str, int]] = None
+    ):
+        self.concurrency = concurrency
+        self.stage_limits = stage_limits or {
+            "tts": settings.VIDEO_TTS_CONCURRENCY,
+            "lipsync": settings.VIDEO_LIPSYNC_CONCURRENCY
+        }
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._busy = {stage: 0 for stage in STAGES}
+        self._stopping = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._running_jobs: Dict[int, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """Recover orphaned jobs and start the worker loops"""
+        if self.running:
+            return
+        self._stopping = asyncio.Event()
+        recovered = await asyncio.to_thread(video_job_queue.recover_orphans)
+        if recovered:
+            print(f"Requeued {recovered} orphaned video jobs")
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f"video-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._workers.append(asyncio.create_task(self._sweeper_loop(), name="video-job-sweeper"))
+
+    async def stop(self, drain_timeout: float = settings.VIDEO_WORKER_DRAIN_SECONDS):
+        """Stop claiming jobs and give in-flight ones ``drain_timeout`` to finish.
+
+        Jobs still running after that are cancelled and released back to
+        the queue so another worker can pick them up.
+        """
+        if not self.running:
+            return
+        self._stopping.set()
+        _, pending = await asyncio.wait(self._workers, timeout=drain_timeout)
+        if pending:
+            for task in list(self._running_jobs.values()):
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+
+    async def _wait_or_stop(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker_loop(self):
+        while not self._stopping.is_set():
+            job = await self._claim_next()
+            if job is None:
+                await self._wait_or_stop(settings.VIDEO_JOB_POLL_INTERVAL)
+                continue
+            try:
+                await self._run_job(job)
+            finally:
+                self._busy[job.stage] -= 1
+
+    async def _claim_next(self) -> Optional[VideoJob]:
+        """Claim a job from a stage with spare capacity, reserving its slot.
+
+        Later stages are tried first so videos already in flight finish
+        before new ones are started.
+        """
+        for stage in reversed(STAGES):
+            if self._busy[stage] >= self.stage_limits[stage]:
+                continue
+            self._busy[stage] += 1
+            job = None
+            try:
+                job = await asyncio.to_thread(video_job_queue.claim, [stage], self.worker_id)
+            except Exception as e:
+                print(f"Error claiming video job: {e}")
+            if job is not None:
+                return job
+            self._busy[stage] -= 1
+        return None
+
+    async def _sweeper_loop(self):
+        """Periodically requeue jobs abandoned by dead workers"""
+        while not self._stopping.is_set():
+            await self._wait_or_stop(video_job_queue.lease_seconds)
+            if self._stopping.is_set():
+                break
+            try:
+                recovered = await asyncio.to_thread(video_job_queue.recover_orphans)
+                if recovered:
+                    print(f"Requeued {recovered} orphaned video jobs")
+            except Exception as e:
+                print(f"Error recovering video jobs: {e}")
+
+    async def _run_job(self, job: VideoJob):
+        stage_task = asyncio.create_task(self._run_stage(job))
+        self._running_jobs[job.id] = stage_task
+        heartbeat = asyncio.create_task(self._keep_lease(job, stage_task))
+        try:
+            success = await stage_task
+        except asyncio.CancelledError:
+            if self._stopping.is_set():
+                await asyncio.to_thread(video_job_queue.release, job.id, self.worker_id)
+            return
+        except Exception as e:
+            print(f"Video job {job.id} ({job.stage}) failed: {e}")
+            await asyncio.to_thread(video_job_queue.fail, job.id, self.worker_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+            self._running_jobs.pop(job.id, None)
+
+        if not success:
+            await asyncio.to_thread(
+                video_job_queue.fail, job.id, self.worker_id, f"{job.stage} stage failed"
+            )
+        elif job.stage == "tts":
+            video_values = {"audio_url": upload_url(job.audio_path)}
+            if await video_service.fetch_cached_lipsync_video(
+                job.audio_path, job.avatar_path, job.video_path
+            ):
+                # Already rendered this audio with this avatar; skip the lip-sync queue
+                video_values["video_url"] = upload_url(job.video_path)
+                await asyncio.to_thread(video_job_queue.complete, job, self.worker_id, video_values)
+            else:
+                await asyncio.to_thread(
+                    video_job_queue.advance, job, self.worker_id, "lipsync", video_values
+                )
+        else:
+            await asyncio.to_thread(
+                video_job_queue.complete, job, self.worker_id,
+                {"video_url": upload_url(job.video_path)}
+            )
+
+    async def _run_stage(self, job: VideoJob) -> bool:
+        if job.stage == "tts":
+            return await elevenlabs_service.generate_speech(
+                text=job.lesson_text,
+                voice_id=job.voice_id,
+                output_path=job.audio_path
+            )
+        return await video_service.generate_lipsync_video(
+            audio_path=job.audio_path,
+            image_path=job.avatar_path,
+            output_path=job.video_path
+        )
+
+    async def _keep_lease(self, job: VideoJob, stage_task: asyncio.Task):
+        """Renew the lease while the stage runs; cancel it if the lease is lost"""
+        interval = max(video_job_queue.lease_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                still_ours = await asyncio.to_thread(
+                    video_job_queue.renew_lease, job.id, self.worker_id
+                )
+            except Exception as e:
+                print(f"Error renewing lease for video job {job.id}: {e}")
+                continue
+            if not still_ours:
+                print(f"Lost lease on video job {job.id}, abandoning it")
+                stage_task.cancel()
+                return
+
+# Create a singleton instance
+video_worker_pool = VideoWorkerPool()
@@ -0,0 +1,65 @@
+"""Standalone video generation worker.
+
+Run one or more of these next to the API to take rendering out of the
+uvicorn processes:
+
+    python -m app.worker --concurrency 4 --tts 2 --lipsync 2
+
+Set ``VIDEO_WORKERS_IN_API=false`` on the API so it only enqueues jobs.
+Workers coordinate through the ``video_jobs`` table, so they can run on any
+host that reaches the same database and upload directory.
+"""
+
+import argparse
+import asyncio
+import signal
+
+from app.core.config import settings
+from app.db.init_db import init_db
+from app.services.elevenlabs_service import elevenlabs_service
+from app.services.video_service import video_service
+from app.services.video_worker import VideoWorkerPool
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Lexora video generation worker")
+    parser.add_argument("--concurrency", type=int, default=settings.VIDEO_WORKER_CONCURRENCY,
+                        help="Max jobs in flight in this worker")
+    parser.add_argument("--tts", type=int, default=settings.VIDEO_TTS_CONCURRENCY,
+                        help="Max concurrent text-to-speech stages")
+    parser.add_argument("--lipsync", type=int, default=settings.VIDEO_LIPSYNC_CONCURRENCY,
+                        help="Max concurrent lip-sync stages")
+    parser.add_argument("--drain-seconds", type=float, default=settings.VIDEO_WORKER_DRAIN_SECONDS,
+                        help="How long in-flight jobs may finish after SIGTERM")
+    return parser.parse_args()
+
+async def run(args):
+    pool = VideoWorkerPool(
+        concurrency=args.concurrency,
+        stage_limits={"tts": args.tts, "lipsync": args.lipsync}
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await elevenlabs_service.startup()
+    await video_service.startup()
+    await pool.start()
+    print(f"Video worker {pool.worker_id} started "
+          f"(concurrency={args.concurrency}, tts={args.tts}, lipsync={args.lipsync})")
+
+    await stop.wait()
+    print(f"Video worker {pool.worker_id} draining in-flight jobs")
+    await pool.stop(drain_timeout=args.drain_seconds)
+    await elevenlabs_service.shutdown()
+    await video_service.shutdown()
+    print(f"Video worker {pool.worker_id} stopped")
+
+def main():
+    args = parse_args()
+    init_db()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read at import time, so point the app at a scratch database
+# and directories before anything from app is imported
+_TMP_DIR = tempfile.mkdtemp(prefix="lexora-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_TMP_DIR}/test.db",
+    UPLOAD_DIR=os.path.join(_TMP_DIR, "uploads"),
+    CACHE_DIR=os.path.join(_TMP_DIR, "cache"),
+    VIDEO_WORKERS_IN_API="false",
+    # Tests flush buffered progress explicitly
+    PROGRESS_FLUSH_INTERVAL="3600",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+API = "/api/v1"
+PLANNED = ("SELECT", "UPDATE", "DELETE", "INSERT")
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+def register(client, email=None, password="secret-password"):
+    """Register and log in a fresh user; returns (auth headers, token body)"""
+    email = email or f"{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post(f"{API}/auth/register", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    response = client.post(f"{API}/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    tokens = response.json()
+    return {"Authorization": f"Bearer {tokens['access_token']}"}, tokens
+
+@pytest.fixture
+def auth(client):
+    headers, _ = register(client)
+    return headers
+
+def create_course(client, headers, lessons=3):
+    """Topic with one learning path and ``lessons`` lessons"""
+    topic = client.post(f"{API}/topics/", json={"title": "Topic"}, headers=headers).json()
+    path = client.post(
+        f"{API}/learning-paths/", json={"title": "Path", "topic_id": topic["id"]}, headers=headers
+    ).json()
+    created = client.post(f"{API}/lessons/bulk", json=[
+        {
+            "title": f"Lesson {i}",
+            "content": f"Content of lesson {i}",
+            "week_number": 1 + i // 5,
+            "day_number": 1 + i % 5,
+            "learning_path_id": path["id"],
+        }
+        for i in range(lessons)
+    ], headers=headers).json()
+    return topic, path, created
+
+@pytest.fixture
+def captured():
+    """SQL statements the app runs while the fixture is active"""
+    from app.db.database import async_engine, async_write_engine, engine, write_engine
+    statements = []
+    engines = [e.sync_engine if hasattr(e, "sync_engine") else e
+               for e in (async_engine, async_write_engine, engine, write_engine) if e is not None]
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(PLANNED):
+            if executemany and parameters and isinstance(parameters[0], (list, tuple)):
+                parameters = parameters[0]
+            statements.append((statement, tuple(parameters or ())))
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", capture)
+    yield statements
+    for target in engines:
+        event.remove(target, "before_cursor_execute", capture)
+
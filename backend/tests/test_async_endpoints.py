@@ -0,0 +1,25 @@
+import inspect
+
+from fastapi.routing import APIRoute
+from sqlalchemy.orm import Session
+
+from app.main import app
+
+def dependency_calls(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency
+        yield from dependency_calls(dependency)
+
+def test_async_endpoints_do_not_use_sync_sessions():
+    """A sync Session in an async handler blocks the event loop on every query"""
+    blocking = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for dependant in [route.dependant, *dependency_calls(route.dependant)]:
+            if dependant.call is None or not inspect.iscoroutinefunction(dependant.call):
+                continue
+            for parameter in inspect.signature(dependant.call).parameters.values():
+                if parameter.annotation is Session:
+                    blocking.append(f"{route.path} {dependant.call.__name__}({parameter.name})")
+    assert blocking == []
@@ -0,0 +1,40 @@
+from conftest import API, register
+
+def refresh(client, token):
+    return client.post(f"{API}/auth/refresh", json={"refresh_token": token})
+
+def test_refresh_rotates_tokens(client):
+    _, tokens = register(client)
+    response = refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200, response.text
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    me = client.get(f"{API}/users/me", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert me.status_code == 200
+
+def test_reused_refresh_token_revokes_the_family(client):
+    _, tokens = register(client)
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    # Replaying the spent token looks like theft, so the new one dies too
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+
+def test_logout_revokes_refresh_token(client):
+    _, tokens = register(client)
+    response = client.post(f"{API}/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+def test_refresh_after_logout_keeps_other_sessions(client):
+    email = "two-tabs@example.com"
+    _, first = register(client, email=email)
+    second = client.post(
+        f"{API}/auth/login", json={"email": email, "password": "secret-password"}
+    ).json()
+
+    client.post(f"{API}/auth/logout", json={"refresh_token": first["refresh_token"]})
+    # A stale retry from the logged out tab is just rejected
+    assert refresh(client, first["refresh_token"]).status_code == 401
+    assert refresh(client, second["refresh_token"]).status_code == 200
@@ -0,0 +1,46 @@
+from conftest import API, create_course, register
+
+def test_bulk_create_update_delete(client, auth):
+    _, path, lessons = create_course(client, auth, lessons=3)
+    assert [lesson["title"] for lesson in lessons] == ["Lesson 0", "Lesson 1", "Lesson 2"]
+
+    response = client.patch(f"{API}/lessons/bulk", json=[
+        {"id": lessons[0]["id"], "title": "Intro"},
+        {"id": lessons[2]["id"], "title": "Wrap-up", "day_number": 5},
+    ], headers=auth)
+    assert response.status_code == 200, response.text
+    updated = {lesson["id"]: lesson for lesson in response.json()}
+    assert updated[lessons[0]["id"]]["title"] == "Intro"
+    assert updated[lessons[2]["id"]]["day_number"] == 5
+
+    ids = [lesson["id"] for lesson in lessons]
+    response = client.post(f"{API}/lessons/bulk/delete", json={"ids": ids}, headers=auth)
+    assert response.status_code == 200, response.text
+    response = client.get(f"{API}/lessons/learning-path/{path['id']}", headers=auth)
+    assert response.json() == []
+
+def test_bulk_operations_are_all_or_nothing_across_owners(client, auth):
+    other, _ = register(client)
+    _, path, lessons = create_course(client, auth, lessons=2)
+    _, other_path, other_lessons = create_course(client, other, lessons=1)
+
+    response = client.post(f"{API}/lessons/bulk", json=[
+        {"title": "Mine", "content": "", "week_number": 1, "day_number": 1, "learning_path_id": path["id"]},
+        {"title": "Theirs", "content": "", "week_number": 1, "day_number": 1, "learning_path_id": other_path["id"]},
+    ], headers=auth)
+    assert response.status_code == 404
+
+    response = client.patch(f"{API}/lessons/bulk", json=[
+        {"id": lessons[0]["id"], "title": "Renamed"},
+        {"id": other_lessons[0]["id"], "title": "Renamed"},
+    ], headers=auth)
+    assert response.status_code == 404
+
+    response = client.post(
+        f"{API}/lessons/bulk/delete",
+        json={"ids": [lessons[0]["id"], other_lessons[0]["id"]]},
+        headers=auth
+    )
+    assert response.status_code == 404
+    remaining = client.get(f"{API}/lessons/learning-path/{path['id']}", headers=auth).json()
+    assert [lesson["title"] for lesson in remaining] == ["Lesson 0", "Lesson 1"]
@@ -0,0 +1,87 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core.cache import AsyncTTLCache, TTLCache
+from app.services.file_cache import FileCache
+
+def test_ttl_cache_expires_and_evicts(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(ttl=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    # "b" was least recently used
+    assert cache.get("b") is None
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+@pytest.mark.anyio
+async def test_async_cache_shares_loads_and_serves_stale():
+    cache = AsyncTTLCache(ttl=0.05, stale_ttl=10)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return len(calls)
+
+    assert await asyncio.gather(cache.get("k", loader), cache.get("k", loader)) == [1, 1]
+    assert len(calls) == 1
+
+    # Stale entries are served while one refresh runs in the background
+    await asyncio.sleep(0.06)
+    assert await cache.get("k", loader) == 1
+    await asyncio.sleep(0.01)
+    assert await cache.get("k", loader) == 2
+
+    cache.invalidate()
+    assert await cache.get("k", loader) == 3
+
+def test_file_cache_round_trip_and_eviction(tmp_path):
+    cache = FileCache(str(tmp_path / "cache"), max_bytes=10, suffix=".bin")
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"123456")
+
+    first = cache.make_key("first")
+    asyncio.run(cache.store(first, str(source)))
+    dest = tmp_path / "out" / "first.bin"
+    assert asyncio.run(cache.fetch(first, str(dest)))
+    assert dest.read_bytes() == b"123456"
+    # Deleting the caller's copy leaves the entry in place
+    os.remove(dest)
+    assert os.path.exists(cache.path_for(first))
+
+    os.utime(cache.path_for(first), (0, 0))
+    second = cache.make_key("second")
+    asyncio.run(cache.store(second, str(source)))
+    # Over budget, so the least recently used entry goes
+    assert not asyncio.run(cache.fetch(first, str(dest)))
+    assert asyncio.run(cache.fetch(second, str(dest)))
+
+@pytest.mark.anyio
+async def test_invalidating_one_key_keeps_other_loads():
+    cache = AsyncTTLCache(ttl=60, stale_ttl=0)
+    release = asyncio.Event()
+    calls = {"a": 0, "b": 0}
+
+    def loader(key):
+        async def load():
+            calls[key] += 1
+            await release.wait()
+            return f"{key}{calls[key]}"
+        return load
+
+    loads = [asyncio.create_task(cache.get(key, loader(key))) for key in ("a", "b")]
+    await asyncio.sleep(0)
+    cache.invalidate("a")
+    release.set()
+    assert await asyncio.gather(*loads) == ["a1", "b1"]
+
+    # "b" was stored, the invalidated load of "a" was not
+    assert await cache.get("b", loader("b")) == "b1"
+    assert await cache.get("a", loader("a")) == "a2"
@@ -0,0 +1,42 @@
+from conftest import API
+
+FUTURE = "Fri, 01 Jan 2100 00:00:00 GMT"
+
+def create_topic(client, headers, title):
+    response = client.post(f"{API}/topics/", json={"title": title}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_single_resource_revalidation(client, auth):
+    topic = create_topic(client, auth, "Biology")
+    url = f"{API}/topics/{topic['id']}"
+    response = client.get(url, headers=auth)
+    etag = response.headers["ETag"]
+    assert "Last-Modified" in response.headers
+
+    response = client.get(url, headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    response = client.get(url, headers={**auth, "If-Modified-Since": FUTURE})
+    assert response.status_code == 304
+
+    client.put(url, json={"title": "Cell biology"}, headers=auth)
+    response = client.get(url, headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Cell biology"
+
+def test_pages_ignore_if_modified_since(client, auth):
+    first = create_topic(client, auth, "Chemistry")
+    create_topic(client, auth, "Physics")
+    url = f"{API}/topics/"
+    response = client.get(url, headers=auth)
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+    assert client.get(url, headers={**auth, "If-None-Match": etag}).status_code == 304
+
+    # Deleting a row leaves the newest timestamp unchanged, but not the ETag
+    client.delete(f"{API}/topics/{first['id']}", headers=auth)
+    response = client.get(url, headers={**auth, "If-Modified-Since": FUTURE})
+    assert response.status_code == 200
+    assert [topic["title"] for topic in response.json()] == ["Physics"]
+    assert client.get(url, headers={**auth, "If-None-Match": etag}).status_code == 200
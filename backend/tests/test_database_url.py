@@ -0,0 +1,27 @@
+import pytest
+
+from app.db.database import async_connect_args, async_database_url
+
+def test_sqlite_url_uses_aiosqlite():
+    assert async_database_url("sqlite:///./lexora.db") == "sqlite+aiosqlite:///./lexora.db"
+    assert async_connect_args("sqlite:///./lexora.db") == {}
+
+def test_postgres_sslmode_becomes_ssl_argument():
+    url = "postgresql://user:pw@db.example.com:5432/lexora?sslmode=require&application_name=api"
+    assert async_database_url(url) == (
+        "postgresql+asyncpg://user:pw@db.example.com:5432/lexora?application_name=api"
+    )
+    assert async_connect_args(url) == {"ssl": "require"}
+
+def test_postgres_without_sslmode():
+    url = "postgresql://user:pw@localhost/lexora"
+    assert async_database_url(url) == "postgresql+asyncpg://user:pw@localhost/lexora"
+    assert async_connect_args(url) == {}
+
+def test_unknown_sslmode_is_rejected():
+    with pytest.raises(ValueError, match="sslmode"):
+        async_connect_args("postgresql://localhost/lexora?sslmode=sometimes")
+
+def test_unsupported_backend_is_rejected():
+    with pytest.raises(ValueError, match="mysql"):
+        async_database_url("mysql://localhost/lexora")
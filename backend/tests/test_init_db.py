@@ -0,0 +1,23 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_concurrent_startups_migrate_once(tmp_path):
+    database = tmp_path / "fresh.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}")
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "app.db.init_db"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        for _ in range(4)
+    ]
+    outputs = [process.communicate(timeout=120)[0].decode() for process in processes]
+    assert [process.returncode for process in processes] == [0] * 4, outputs
+
+    with sqlite3.connect(database) as connection:
+        versions = connection.execute("SELECT version_num FROM alembic_version").fetchall()
+    assert len(versions) == 1
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import create_course
+from app.db.database import SessionLocal
+from app.models.video import Video
+from app.models.video_job import VideoJob
+from app.services.job_queue import VideoJobQueue
+
+@pytest.fixture
+def queue():
+    return VideoJobQueue()
+
+@pytest.fixture
+def job_id(client, auth, queue):
+    _, _, lessons = create_course(client, auth, lessons=1)
+    db = SessionLocal()
+    try:
+        video = Video(title="Video", video_url="", lesson_id=lessons[0]["id"], status="processing")
+        job = queue.enqueue(db, video, "Hello", "voice", "avatar.png")
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+def read_job(job_id):
+    db = SessionLocal()
+    try:
+        return db.get(VideoJob, job_id)
+    finally:
+        db.close()
+
+def test_claim_lease_and_advance(queue, job_id):
+    job = queue.claim(["tts"], "worker-a")
+    assert job.id == job_id and job.attempts == 1
+    # A claimed job is leased to one worker only
+    assert queue.claim(["tts"], "worker-b") is None
+    assert queue.renew_lease(job_id, "worker-a")
+    assert not queue.renew_lease(job_id, "worker-b")
+
+    assert queue.advance(job, "worker-a", "lipsync", {Video.audio_url: "/audio.mp3"})
+    assert queue.claim(["tts"], "worker-b") is None
+    job = queue.claim(["lipsync"], "worker-b")
+    assert job.id == job_id and job.stage == "lipsync"
+
+    assert queue.complete(job, "worker-b", {Video.video_url: "/video.mp4"})
+    assert read_job(job_id).status == "completed"
+    assert not queue.complete(job, "worker-b", {})
+
+def test_expired_lease_is_recovered(queue, job_id):
+    queue.claim(["tts"], "worker-a")
+    db = SessionLocal()
+    try:
+        db.query(VideoJob).filter(VideoJob.id == job_id).update(
+            {VideoJob.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    assert queue.recover_orphans() == 1
+    assert read_job(job_id).status == "pending"
+    # The worker that lost its lease can no longer touch the job
+    assert not queue.renew_lease(job_id, "worker-a")
+    assert queue.claim(["tts"], "worker-b").attempts == 2
+    # Releasing hands the job back without spending an attempt
+    assert queue.release(job_id, "worker-b")
+    job = queue.claim(["tts"], "worker-c")
+    assert job.attempts == 2
+    assert queue.complete(job, "worker-c", {})
+
+def test_failures_retry_then_give_up(queue, job_id):
+    queue.max_attempts = 2
+    queue.retry_delay = 0
+    queue.claim(["tts"], "worker-a")
+    assert not queue.fail(job_id, "worker-a", "boom")
+    queue.claim(["tts"], "worker-a")
+    assert queue.fail(job_id, "worker-a", "boom again")
+
+    job = read_job(job_id)
+    assert (job.status, job.last_error) == ("failed", "boom again")
@@ -0,0 +1,46 @@
+from conftest import API, create_course, register
+
+def add_lessons(client, headers, path_id, lessons):
+    response = client.post(f"{API}/lessons/bulk", json=[
+        {
+            "title": title,
+            "content": content,
+            "week_number": 1,
+            "day_number": day,
+            "learning_path_id": path_id,
+        }
+        for day, (title, content) in enumerate(lessons, start=1)
+    ], headers=headers)
+    assert response.status_code == 200, response.text
+
+def test_search_ranks_matches_and_marks_snippets(client, auth):
+    _, path, _ = create_course(client, auth, lessons=0)
+    add_lessons(client, auth, path["id"], [
+        ("Photosynthesis", "How plants turn light into sugar"),
+        ("Cell division", "Mitosis and meiosis, with a note on photosynthesis"),
+        ("Respiration", "Releasing energy from glucose"),
+    ])
+
+    response = client.get(f"{API}/lessons/search", params={"q": "photosynthesis"}, headers=auth)
+    assert response.status_code == 200, response.text
+    results = response.json()
+    # Title matches outrank content matches
+    assert [r["title"] for r in results] == ["Photosynthesis", "Cell division"]
+    assert "<mark>photosynthesis</mark>" in results[1]["snippet"]
+
+def test_search_terms_do_not_match_owner_id(client, auth):
+    user = client.get(f"{API}/users/me", headers=auth).json()
+    _, path, _ = create_course(client, auth, lessons=0)
+    add_lessons(client, auth, path["id"], [("Algebra", "Solving equations")])
+
+    response = client.get(f"{API}/lessons/search", params={"q": str(user["id"])}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.json() == []
+
+def test_search_is_scoped_to_owner(client, auth):
+    other, _ = register(client)
+    _, path, _ = create_course(client, other, lessons=0)
+    add_lessons(client, other, path["id"], [("Topology", "Open and closed sets")])
+
+    response = client.get(f"{API}/lessons/search", params={"q": "topology"}, headers=auth)
+    assert response.json() == []
@@ -0,0 +1,43 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Float, func, literal_column
+
+from conftest import API, create_course
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.models.lesson import Lesson
+
+RANK = func.bm25(literal_column("lessons_fts"), type_=Float).label("rank")
+
+def test_cursor_round_trip():
+    keys = [Lesson.week_number, Lesson.day_number, Lesson.id]
+    assert decode_cursor(encode_cursor([1, 2, 3]), keys) == [1, 2, 3]
+    # Integral floats serialize as ints
+    assert decode_cursor(encode_cursor([-2, 7]), [RANK, Lesson.id]) == [-2, 7]
+
+@pytest.mark.parametrize("values", [["1"], [1.5], [True], [None], [1, 2]])
+def test_cursor_values_must_fit_key_types(values):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(encode_cursor(values), [Lesson.id])
+    assert error.value.status_code == 400
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException):
+        decode_cursor("not a cursor", [Lesson.id])
+
+def test_pages_follow_the_cursor(client, auth):
+    _, path, lessons = create_course(client, auth, lessons=7)
+    url = f"{API}/lessons/learning-path/{path['id']}"
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, params=params, headers=auth)
+        assert response.status_code == 200, response.text
+        seen += [lesson["id"] for lesson in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(lesson["id"] for lesson in lessons)
+    assert len(seen) == len(set(seen))
+
+    response = client.get(url, params={"cursor": encode_cursor(["1", 1, 1])}, headers=auth)
+    assert response.status_code == 400
@@ -0,0 +1,32 @@
+import threading
+import time
+
+from conftest import API, register
+from app.core import security
+from app.core.security import PasswordHasher
+
+def test_login_is_rejected_while_the_hash_queue_is_full(client, monkeypatch):
+    email = "queue-full@example.com"
+    register(client, email=email)
+    hasher = PasswordHasher(kind="thread", workers=1, max_queue=1)
+    monkeypatch.setattr(security, "password_hasher", hasher)
+
+    credentials = {"email": email, "password": "secret-password"}
+    gate = threading.Event()
+    # One operation running and one queued fill the executor
+    busy = [client.portal.start_task_soon(hasher.run, gate.wait) for _ in range(2)]
+    try:
+        deadline = time.monotonic() + 5
+        while hasher._in_flight < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        response = client.post(f"{API}/auth/login", json=credentials)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    finally:
+        gate.set()
+        for future in busy:
+            future.result(timeout=5)
+        hasher.shutdown()
+
+    assert client.post(f"{API}/auth/login", json=credentials).status_code == 200
@@ -0,0 +1,73 @@
+from conftest import API, create_course
+from app.services.progress_buffer import progress_buffer
+
+def summary(client, headers, path_id):
+    response = client.get(f"{API}/progress/learning-path/{path_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def heartbeat(client, headers, lesson_id, percentage, completed=False):
+    response = client.post(f"{API}/progress/heartbeat", json={
+        "lesson_id": lesson_id,
+        "completion_percentage": percentage,
+        "completed": completed,
+    }, headers=headers)
+    assert response.status_code == 202, response.text
+
+def test_summary_follows_lessons_and_progress(client, auth):
+    _, path, lessons = create_course(client, auth, lessons=4)
+    assert summary(client, auth, path["id"])["lessons_total"] == 4
+
+    heartbeat(client, auth, lessons[0]["id"], 100, completed=True)
+    heartbeat(client, auth, lessons[1]["id"], 50)
+    assert client.portal.call(progress_buffer.flush) == 2
+
+    result = summary(client, auth, path["id"])
+    assert result["lessons_completed"] == 1
+    assert result["avg_completion"] == 150 / 4
+
+    response = client.delete(f"{API}/lessons/{lessons[3]['id']}", headers=auth)
+    assert response.status_code == 200, response.text
+    result = summary(client, auth, path["id"])
+    assert (result["lessons_total"], result["lessons_completed"]) == (3, 1)
+    assert result["avg_completion"] == 150 / 3
+
+def test_summaries_are_listed_per_user(client, auth):
+    _, first, _ = create_course(client, auth, lessons=1)
+    _, second, _ = create_course(client, auth, lessons=2)
+    response = client.get(f"{API}/progress/learning-paths", headers=auth)
+    assert response.status_code == 200, response.text
+    assert [(row["learning_path_id"], row["lessons_total"]) for row in response.json()] == [
+        (first["id"], 1), (second["id"], 2)
+    ]
+
+def test_flushed_progress_has_updated_at(client, auth):
+    _, _, lessons = create_course(client, auth, lessons=1)
+    lesson_id = lessons[0]["id"]
+    heartbeat(client, auth, lesson_id, 30)
+    assert client.portal.call(progress_buffer.flush) == 1
+
+    response = client.get(f"{API}/progress/lesson/{lesson_id}", headers=auth)
+    assert response.status_code == 200, response.text
+    progress = response.json()
+    assert progress["completion_percentage"] == 30
+    assert progress["updated_at"] is not None
+
+def test_watched_course_can_be_deleted(client, auth):
+    user_id = client.get(f"{API}/users/me", headers=auth).json()["id"]
+    topic, path, lessons = create_course(client, auth, lessons=2)
+    heartbeat(client, auth, lessons[0]["id"], 100, completed=True)
+    assert client.portal.call(progress_buffer.flush) == 1
+    # Still buffered when the lesson goes, so it must not be written later
+    heartbeat(client, auth, lessons[1]["id"], 20)
+
+    response = client.delete(f"{API}/lessons/{lessons[0]['id']}", headers=auth)
+    assert response.status_code == 200, response.text
+    response = client.post(f"{API}/lessons/bulk/delete", json={"ids": [lessons[1]["id"]]}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert progress_buffer.pending(user_id, lessons[1]["id"]) is None
+
+    response = client.delete(f"{API}/learning-paths/{path['id']}", headers=auth)
+    assert response.status_code == 200, response.text
+    response = client.delete(f"{API}/topics/{topic['id']}", headers=auth)
+    assert response.status_code == 200, response.text
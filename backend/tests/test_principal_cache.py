@@ -0,0 +1,37 @@
+from conftest import API, register
+from app.core.deps import principal_cache
+from app.db.database import SessionLocal
+from app.models.user import User
+
+def me(client, headers):
+    return client.get(f"{API}/users/me", headers=headers)
+
+def test_profile_update_is_seen_by_cached_principal(client):
+    headers, _ = register(client)
+    email = me(client, headers).json()["email"]
+    assert principal_cache.get(email) is not None
+
+    response = client.put(f"{API}/users/me", json={"full_name": "Ada"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert me(client, headers).json()["full_name"] == "Ada"
+
+    client.put(f"{API}/users/me/preferences", params={"voice_name": "Narrator"}, headers=headers)
+    assert me(client, headers).json()["voice_name"] == "Narrator"
+
+def test_deactivated_user_is_rejected_before_the_ttl_expires(client):
+    headers, _ = register(client)
+    email = me(client, headers).json()["email"]
+    assert principal_cache.get(email) is not None
+
+    # ORM updates go through the mapper listener
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).one()
+        user.is_active = False
+        db.commit()
+    finally:
+        db.close()
+
+    response = me(client, headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
@@ -0,0 +1,37 @@
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.progress import ProgressHeartbeat
+from app.services.progress_buffer import ProgressBuffer
+
+def beat(lesson_id, percentage=10, completed=False):
+    return ProgressHeartbeat(lesson_id=lesson_id, completion_percentage=percentage, completed=completed)
+
+def test_heartbeats_coalesce_and_stay_completed():
+    buffer = ProgressBuffer(flush_interval=5)
+    buffer.record(1, beat(7, 100, completed=True))
+    buffer.record(1, beat(7, 40))
+    assert buffer.pending(1, 7) == {
+        "user_id": 1, "lesson_id": 7, "completion_percentage": 40, "completed": True
+    }
+
+def test_one_user_cannot_fill_the_buffer():
+    buffer = ProgressBuffer(flush_interval=5, max_entries=10, max_per_user=2)
+    buffer.record(1, beat(1))
+    buffer.record(1, beat(2))
+    with pytest.raises(HTTPException) as error:
+        buffer.record(1, beat(3))
+    assert error.value.status_code == 429
+    assert error.value.headers["Retry-After"] == "5"
+    # Updates to lessons already buffered and other users still go through
+    buffer.record(1, beat(2, 80))
+    buffer.record(2, beat(3))
+    assert buffer.pending(1, 2)["completion_percentage"] == 80
+
+def test_global_cap_applies_across_users():
+    buffer = ProgressBuffer(flush_interval=5, max_entries=2, max_per_user=2)
+    buffer.record(1, beat(1))
+    buffer.record(2, beat(1))
+    with pytest.raises(HTTPException) as error:
+        buffer.record(3, beat(1))
+    assert error.value.status_code == 503
@@ -0,0 +1,46 @@
+import re
+
+from conftest import API, create_course
+from app.db.database import engine
+from app.services.job_queue import VideoJobQueue
+from app.services.progress_buffer import progress_buffer
+
+# A SCAN of a real table reads every row; FTS5 scans go through its index
+FULL_SCAN = re.compile(r"^SCAN (?!\S+ VIRTUAL TABLE)")
+
+def test_list_and_ownership_queries_use_indexes(client, auth, captured):
+    topic, path, lessons = create_course(client, auth, lessons=4)
+    lesson_id = lessons[0]["id"]
+    for url in [
+        "/topics/",
+        f"/topics/{topic['id']}",
+        f"/topics/{topic['id']}/tree",
+        f"/learning-paths/topic/{topic['id']}",
+        f"/learning-paths/{path['id']}",
+        f"/lessons/learning-path/{path['id']}",
+        f"/lessons/{lesson_id}",
+        "/lessons/search?q=lesson",
+        f"/videos/lesson/{lesson_id}",
+        f"/progress/lesson/{lesson_id}",
+        "/progress/learning-paths",
+        f"/progress/learning-path/{path['id']}",
+    ]:
+        assert client.get(f"{API}{url}", headers=auth).status_code == 200, url
+
+    client.patch(f"{API}/lessons/bulk", json=[{"id": lesson_id, "title": "Renamed"}], headers=auth)
+    client.post(f"{API}/lessons/bulk/delete", json={"ids": [lessons[3]["id"]]}, headers=auth)
+    client.post(f"{API}/progress/heartbeat", json={"lesson_id": lesson_id, "completion_percentage": 10}, headers=auth)
+    client.portal.call(progress_buffer.flush)
+    queue = VideoJobQueue()
+    queue.claim(["tts"], "plan-check")
+    queue.recover_orphans()
+
+    assert captured
+    full_scans = []
+    with engine.connect() as connection:
+        for statement, parameters in captured:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            scans = [row[3] for row in plan if FULL_SCAN.match(row[3])]
+            if scans:
+                full_scans.append((" ".join(statement.split()), scans))
+    assert full_scans == []
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import false, select, update
+
+from app.db.database import SessionLocal, engine, write_engine
+from app.models.topic import Topic
+
+pytestmark = pytest.mark.skipif(write_engine is None, reason="single writer is disabled")
+
+def test_reads_after_a_write_stay_on_the_writer(client):
+    db = SessionLocal()
+    try:
+        assert db.get_bind(clause=select(Topic)) is engine
+        db.execute(update(Topic).where(false()).values(title="x"))
+        # Same transaction: its reads must not wait on the read pool
+        assert db.get_bind(clause=select(Topic)) is write_engine
+        db.execute(select(Topic.id).limit(1))
+        db.commit()
+        assert db.get_bind(clause=select(Topic)) is engine
+
+        db.execute(update(Topic).where(false()).values(title="x"))
+        db.rollback()
+        assert db.get_bind(clause=select(Topic)) is engine
+    finally:
+        db.close()
@@ -0,0 +1,45 @@
+from conftest import API, create_course, register
+from app.db.database import SessionLocal
+from app.models.progress import Progress
+from app.models.video import Video
+
+def add_rows(*rows):
+    db = SessionLocal()
+    try:
+        db.add_all(rows)
+        db.commit()
+        return [row.id for row in rows]
+    finally:
+        db.close()
+
+def test_tree_loads_a_course_in_five_queries(client, auth, captured):
+    user_id = client.get(f"{API}/users/me", headers=auth).json()["id"]
+    other_id = client.get(f"{API}/users/me", headers=register(client)[0]).json()["id"]
+    topic, path, lessons = create_course(client, auth, lessons=6)
+    client.post(f"{API}/learning-paths/", json={"title": "Second", "topic_id": topic["id"]}, headers=auth)
+    lesson_id = lessons[0]["id"]
+
+    def video(title):
+        return Video(title=title, video_url=f"/{title}.mp4", lesson_id=lesson_id,
+                     owner_id=user_id, status="completed")
+    _, latest_id = add_rows(video("old"), video("new"))
+    add_rows(
+        Progress(user_id=user_id, lesson_id=lesson_id, completion_percentage=40),
+        # Nothing in the API writes this, but it must never leak into the tree
+        Progress(user_id=other_id, lesson_id=lessons[1]["id"], completion_percentage=90),
+    )
+
+    captured.clear()
+    response = client.get(f"{API}/topics/{topic['id']}/tree", headers=auth)
+    assert response.status_code == 200, response.text
+    selects = [statement for statement, _ in captured if statement.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 5, selects
+
+    tree = response.json()
+    assert [p["title"] for p in tree["learning_paths"]] == ["Path", "Second"]
+    nodes = tree["learning_paths"][0]["lessons"]
+    assert [node["id"] for node in nodes] == [lesson["id"] for lesson in lessons]
+    assert nodes[0]["latest_video"]["id"] == latest_id
+    assert nodes[0]["progress"]["completion_percentage"] == 40
+    assert all(node["latest_video"] is None for node in nodes[1:])
+    assert all(node["progress"] is None for node in nodes[1:])
@@ -0,0 +1,72 @@
+import json
+
+import httpx
+import pytest
+
+from conftest import API
+from app.core.config import settings
+from app.services.elevenlabs_service import ElevenLabsService, _strip_id3, split_text
+from app.services.file_cache import tts_cache
+
+ID3_HEADER = b"ID3\x04\x00\x00\x00\x00\x00\x00"
+ID3_TRAILER = b"TAG" + b"\x00" * 125
+
+def fake_mp3(text: str) -> bytes:
+    return ID3_HEADER + b"\xff\xfb" + text.encode("utf-8") + ID3_TRAILER
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "TTS_CHUNK_MAX_CHARS", 20)
+
+    def synthesize(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=fake_mp3(json.loads(request.content)["text"]))
+
+    service = ElevenLabsService()
+    service.api_key = "test-key"
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(synthesize))
+    return service
+
+@pytest.mark.anyio
+async def test_multi_chunk_stream_caches_a_clean_mp3(service, tmp_path):
+    text = "First sentence here. Second sentence here. Third one."
+    output_path = str(tmp_path / "speech.mp3")
+
+    streamed = b"".join([data async for data in service.stream_speech(text, "voice", output_path)])
+
+    parts = [fake_mp3(chunk) for chunk in split_text(text, settings.TTS_CHUNK_MAX_CHARS)]
+    assert len(parts) > 1
+    assert streamed == b"".join(parts)
+
+    with open(output_path, "rb") as f:
+        stored = f.read()
+    # Only the first chunk's ID3 header and the last chunk's trailer remain
+    last = len(parts) - 1
+    assert stored == b"".join(
+        _strip_id3(part, keep_header=i == 0, keep_trailer=i == last) for i, part in enumerate(parts)
+    )
+    assert stored.count(b"ID3") == 1 and stored.count(b"TAG") == 1
+
+    # The cached entry is the cleaned file, shared with generate_speech
+    cache_key = tts_cache.make_key(text, "voice", "eleven_monolingual_v1",
+                                   {"stability": 0.5, "similarity_boost": 0.5})
+    cached_path = str(tmp_path / "cached.mp3")
+    assert await tts_cache.fetch(cache_key, cached_path)
+    with open(cached_path, "rb") as f:
+        assert f.read() == stored
+    assert not list(tmp_path.glob("*.partial*"))
+
+@pytest.mark.anyio
+async def test_empty_text_is_not_streamed_or_cached(service, tmp_path):
+    output_path = str(tmp_path / "speech.mp3")
+    with pytest.raises(ValueError):
+        async for _ in service.stream_speech("  \n ", "voice", output_path):
+            pass
+    assert not await service.generate_speech(" ", "voice", output_path)
+    assert not list(tmp_path.iterdir())
+
+@pytest.mark.parametrize("path", ["/voices/generate-speech", "/voices/generate-speech/stream"])
+def test_speech_endpoints_reject_empty_text(client, auth, monkeypatch, path):
+    monkeypatch.setattr(settings, "ELEVENLABS_API_KEY", "test-key")
+    response = client.post(f"{API}{path}", data={"text": "   ", "voice_id": "voice"}, headers=auth)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Text must not be empty"